@@ -66,88 +66,188 @@ __version__ = "0.2.0"  # Updated with session keys + autonomy
 __author__ = "ZendFi Team"
 __email__ = "support@zendfi.tech"
 
-# Core tools - the main export
-from langchain_zendfi.tools import (
-    ZendFiPaymentTool,
-    ZendFiMarketplaceTool,
-    ZendFiBalanceTool,
-    ZendFiCreateSessionTool,
-    ZendFiAgentSessionTool,
-    ZendFiPricingTool,
-    create_zendfi_tools,
-    create_minimal_zendfi_tools,
-)
-
-# Client for direct API access
-from langchain_zendfi.client import (
-    ZendFiClient,
-    ZendFiMode,
-    SessionKeyResult,
-    SessionKeyStatus,
-    PaymentResult,
-    SmartPaymentResult,
-    AgentSession,
-    SessionLimits,
-    PPPFactor,
-    PricingSuggestion,
-    AgentProvider,
-    ZendFiAPIError,
-    AuthenticationError,
-    InsufficientBalanceError,
-    SessionKeyExpiredError,
-    SessionKeyNotFoundError,
-    RateLimitError,
-    ValidationError,
-    get_zendfi_client,
-    reset_zendfi_client,
-)
-
-# Utility functions
-from langchain_zendfi.utils import (
-    generate_idempotency_key,
-    format_solana_address,
-    format_usd,
-    validate_solana_address,
-    SessionKeyCache,
-)
-
-# Session Keys (Device-Bound Non-Custodial)
-from langchain_zendfi.session_keys import (
-    CreateSessionKeyOptions,
-    SessionKeyResult as DeviceBoundSessionKeyResult,
-    SessionKeyInfo,
-    DeviceBoundSessionKey,
-    SessionKeysManager,
-)
-
-# Autonomy (Autonomous Agent Signing)
-from langchain_zendfi.autonomy import (
-    EnableAutonomyRequest,
-    AutonomousDelegate,
-    AutonomyStatus,
-    AutonomyManager,
-    calculate_expires_at,
-)
-
-# Crypto Primitives (for advanced usage)
-from langchain_zendfi.crypto import (
-    generate_keypair,
-    SessionKeypair,
-    SessionKeyCrypto,
-    DeviceFingerprintGenerator,
-    EncryptedSessionKey,
-    create_delegation_message,
-    sign_message,
-    sign_message_base64,
-    base58_encode,
-    base58_decode,
-    verify_dependencies,
+import importlib
+from typing import TYPE_CHECKING
+
+# Exports are resolved on first access (PEP 562), so importing one part of
+# the package (e.g. the client) doesn't pull in LangChain and the tools.
+# name -> (module, attribute)
+_EXPORTS = {
+    # Core tools - the main export
+    "ZendFiPaymentTool": ("langchain_zendfi.tools", "ZendFiPaymentTool"),
+    "ZendFiBatchPaymentTool": ("langchain_zendfi.tools", "ZendFiBatchPaymentTool"),
+    "ZendFiMarketplaceTool": ("langchain_zendfi.tools", "ZendFiMarketplaceTool"),
+    "ZendFiBalanceTool": ("langchain_zendfi.tools", "ZendFiBalanceTool"),
+    "ZendFiSessionTool": ("langchain_zendfi.tools", "ZendFiSessionTool"),
+    "ZendFiCreateSessionTool": ("langchain_zendfi.tools", "ZendFiCreateSessionTool"),
+    "ZendFiAgentSessionTool": ("langchain_zendfi.tools", "ZendFiAgentSessionTool"),
+    "ZendFiPricingTool": ("langchain_zendfi.tools", "ZendFiPricingTool"),
+    "ZendFiToolkit": ("langchain_zendfi.tools", "ZendFiToolkit"),
+    "create_zendfi_tools": ("langchain_zendfi.tools", "create_zendfi_tools"),
+    "create_minimal_zendfi_tools": ("langchain_zendfi.tools", "create_minimal_zendfi_tools"),
+    # Client for direct API access
+    "ZendFiClient": ("langchain_zendfi.client", "ZendFiClient"),
+    "ZendFiMode": ("langchain_zendfi.client", "ZendFiMode"),
+    "SessionKeyResult": ("langchain_zendfi.client", "SessionKeyResult"),
+    "SessionKeyStatus": ("langchain_zendfi.client", "SessionKeyStatus"),
+    "PaymentResult": ("langchain_zendfi.client", "PaymentResult"),
+    "SmartPaymentResult": ("langchain_zendfi.client", "SmartPaymentResult"),
+    "AgentSession": ("langchain_zendfi.client", "AgentSession"),
+    "SessionLimits": ("langchain_zendfi.client", "SessionLimits"),
+    "PPPFactor": ("langchain_zendfi.client", "PPPFactor"),
+    "PricingSuggestion": ("langchain_zendfi.client", "PricingSuggestion"),
+    "AgentProvider": ("langchain_zendfi.client", "AgentProvider"),
+    "ZendFiAPIError": ("langchain_zendfi.client", "ZendFiAPIError"),
+    "AuthenticationError": ("langchain_zendfi.client", "AuthenticationError"),
+    "InsufficientBalanceError": ("langchain_zendfi.client", "InsufficientBalanceError"),
+    "SessionKeyExpiredError": ("langchain_zendfi.client", "SessionKeyExpiredError"),
+    "SessionKeyNotFoundError": ("langchain_zendfi.client", "SessionKeyNotFoundError"),
+    "RateLimitError": ("langchain_zendfi.client", "RateLimitError"),
+    "ValidationError": ("langchain_zendfi.client", "ValidationError"),
+    "get_zendfi_client": ("langchain_zendfi.client", "get_zendfi_client"),
+    "reset_zendfi_client": ("langchain_zendfi.client", "reset_zendfi_client"),
+    # Utility functions
+    "generate_idempotency_key": ("langchain_zendfi.utils", "generate_idempotency_key"),
+    "format_solana_address": ("langchain_zendfi.utils", "format_solana_address"),
+    "format_usd": ("langchain_zendfi.utils", "format_usd"),
+    "format_usd_many": ("langchain_zendfi.utils", "format_usd_many"),
+    "validate_solana_address": ("langchain_zendfi.utils", "validate_solana_address"),
+    "validate_solana_addresses": ("langchain_zendfi.utils", "validate_solana_addresses"),
+    "SessionKeyCache": ("langchain_zendfi.utils", "SessionKeyCache"),
+    # Session Keys (Device-Bound Non-Custodial)
+    "CreateSessionKeyOptions": ("langchain_zendfi.session_keys", "CreateSessionKeyOptions"),
+    "DeviceBoundSessionKeyResult": ("langchain_zendfi.session_keys", "SessionKeyResult"),
+    "SessionKeyInfo": ("langchain_zendfi.session_keys", "SessionKeyInfo"),
+    "DeviceBoundSessionKey": ("langchain_zendfi.session_keys", "DeviceBoundSessionKey"),
+    "SessionKeysManager": ("langchain_zendfi.session_keys", "SessionKeysManager"),
+    # Autonomy (Autonomous Agent Signing)
+    "EnableAutonomyRequest": ("langchain_zendfi.autonomy", "EnableAutonomyRequest"),
+    "AutonomousDelegate": ("langchain_zendfi.autonomy", "AutonomousDelegate"),
+    "AutonomyStatus": ("langchain_zendfi.autonomy", "AutonomyStatus"),
+    "AutonomyManager": ("langchain_zendfi.autonomy", "AutonomyManager"),
+    "calculate_expires_at": ("langchain_zendfi.autonomy", "calculate_expires_at"),
+    # Crypto Primitives (for advanced usage)
+    "generate_keypair": ("langchain_zendfi.crypto", "generate_keypair"),
+    "SessionKeypair": ("langchain_zendfi.crypto", "SessionKeypair"),
+    "SessionKeyCrypto": ("langchain_zendfi.crypto", "SessionKeyCrypto"),
+    "DeviceFingerprintGenerator": ("langchain_zendfi.crypto", "DeviceFingerprintGenerator"),
+    "EncryptedSessionKey": ("langchain_zendfi.crypto", "EncryptedSessionKey"),
+    "create_delegation_message": ("langchain_zendfi.crypto", "create_delegation_message"),
+    "sign_message": ("langchain_zendfi.crypto", "sign_message"),
+    "sign_message_base64": ("langchain_zendfi.crypto", "sign_message_base64"),
+    "base58_encode": ("langchain_zendfi.crypto", "base58_encode"),
+    "base58_decode": ("langchain_zendfi.crypto", "base58_decode"),
+    "verify_dependencies": ("langchain_zendfi.crypto", "verify_dependencies"),
     # Lit Protocol (for autonomous signing)
-    encrypt_keypair_with_lit,
-    LitEncryptionResult,
-    HAS_NACL,
-    HAS_CRYPTOGRAPHY,
-)
+    "encrypt_keypair_with_lit": ("langchain_zendfi.crypto", "encrypt_keypair_with_lit"),
+    "LitEncryptionResult": ("langchain_zendfi.crypto", "LitEncryptionResult"),
+    "HAS_NACL": ("langchain_zendfi.crypto", "HAS_NACL"),
+    "HAS_CRYPTOGRAPHY": ("langchain_zendfi.crypto", "HAS_CRYPTOGRAPHY"),
+}
+
+if TYPE_CHECKING:
+    # Core tools - the main export
+    from langchain_zendfi.tools import (
+        ZendFiPaymentTool,
+        ZendFiBatchPaymentTool,
+        ZendFiMarketplaceTool,
+        ZendFiBalanceTool,
+        ZendFiSessionTool,
+        ZendFiCreateSessionTool,
+        ZendFiAgentSessionTool,
+        ZendFiPricingTool,
+        ZendFiToolkit,
+        create_zendfi_tools,
+        create_minimal_zendfi_tools,
+    )
+
+    # Client for direct API access
+    from langchain_zendfi.client import (
+        ZendFiClient,
+        ZendFiMode,
+        SessionKeyResult,
+        SessionKeyStatus,
+        PaymentResult,
+        SmartPaymentResult,
+        AgentSession,
+        SessionLimits,
+        PPPFactor,
+        PricingSuggestion,
+        AgentProvider,
+        ZendFiAPIError,
+        AuthenticationError,
+        InsufficientBalanceError,
+        SessionKeyExpiredError,
+        SessionKeyNotFoundError,
+        RateLimitError,
+        ValidationError,
+        get_zendfi_client,
+        reset_zendfi_client,
+    )
+
+    # Utility functions
+    from langchain_zendfi.utils import (
+        generate_idempotency_key,
+        format_solana_address,
+        format_usd,
+        format_usd_many,
+        validate_solana_address,
+        validate_solana_addresses,
+        SessionKeyCache,
+    )
+
+    # Session Keys (Device-Bound Non-Custodial)
+    from langchain_zendfi.session_keys import (
+        CreateSessionKeyOptions,
+        SessionKeyResult as DeviceBoundSessionKeyResult,
+        SessionKeyInfo,
+        DeviceBoundSessionKey,
+        SessionKeysManager,
+    )
+
+    # Autonomy (Autonomous Agent Signing)
+    from langchain_zendfi.autonomy import (
+        EnableAutonomyRequest,
+        AutonomousDelegate,
+        AutonomyStatus,
+        AutonomyManager,
+        calculate_expires_at,
+    )
+
+    # Crypto Primitives (for advanced usage)
+    from langchain_zendfi.crypto import (
+        generate_keypair,
+        SessionKeypair,
+        SessionKeyCrypto,
+        DeviceFingerprintGenerator,
+        EncryptedSessionKey,
+        create_delegation_message,
+        sign_message,
+        sign_message_base64,
+        base58_encode,
+        base58_decode,
+        verify_dependencies,
+        # Lit Protocol (for autonomous signing)
+        encrypt_keypair_with_lit,
+        LitEncryptionResult,
+        HAS_NACL,
+        HAS_CRYPTOGRAPHY,
+    )
+
+
+def __getattr__(name: str):
+    try:
+        module, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module), attr)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 # Public API
 __all__ = [
@@ -156,11 +256,14 @@ __all__ = [
     
     # LangChain Tools (primary exports)
     "ZendFiPaymentTool",
+    "ZendFiBatchPaymentTool",
     "ZendFiMarketplaceTool",
     "ZendFiBalanceTool",
+    "ZendFiSessionTool",
     "ZendFiCreateSessionTool",
     "ZendFiAgentSessionTool",
     "ZendFiPricingTool",
+    "ZendFiToolkit",
     "create_zendfi_tools",
     "create_minimal_zendfi_tools",
     
@@ -224,6 +327,8 @@ __all__ = [
     "generate_idempotency_key",
     "format_solana_address",
     "format_usd",
+    "format_usd_many",
     "validate_solana_address",
+    "validate_solana_addresses",
     "SessionKeyCache",
 ]
@@ -27,12 +27,42 @@ from typing import Optional, Dict, Any, List, Union
 from dataclasses import dataclass
 from enum import Enum
 import os
-import uuid
+import json
 import time
 import hashlib
 import asyncio
+import threading
+import weakref
+from urllib.parse import urlencode
 import httpx
 
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Optional fast JSON codec
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+if HAS_ORJSON:
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(data: Any) -> bytes:
+        # Same compact encoding httpx uses for json=
+        return json.dumps(
+            data, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode()
+    
+    _json_loads = json.loads
+
 # SDK Version for User-Agent
 SDK_VERSION = "0.2.0"  # Updated with session keys + autonomy
 
@@ -166,6 +196,14 @@ class AgentProvider:
     available: bool = True
 
 
+# Marketplace sort orders: sort_by -> (sort key, reverse)
+MARKETPLACE_SORT_ORDERS = {
+    "price_asc": (lambda p: p.price_per_unit, False),
+    "price_desc": (lambda p: p.price_per_unit, True),
+    "reputation_desc": (lambda p: p.reputation, True),
+}
+
+
 # ============================================
 # Exceptions
 # ============================================
@@ -232,6 +270,9 @@ class ZendFiClient:
        - Best for browser/mobile apps
     
     Example:
+        >>> async with ZendFiClient(api_key="zk_test_...", mode="test") as client:
+        ...     ...  # one connection pool for the client's lifetime
+        >>> 
         >>> client = ZendFiClient(api_key="zk_test_...", mode="test")
         >>> 
         >>> # Create agent session with spending limits
@@ -263,6 +304,7 @@ class ZendFiClient:
         debug: bool = False,
         timeout: float = 30.0,
         max_retries: int = 3,
+        max_connections: int = 32,
     ):
         """
         Initialize ZendFi client.
@@ -276,6 +318,8 @@ class ZendFiClient:
             debug: Enable debug logging
             timeout: HTTP request timeout in seconds
             max_retries: Maximum retry attempts for transient failures
+            max_connections: Connection pool size (all kept alive between
+                requests), bounding how many requests run in parallel
         """
         self.api_key = api_key or os.getenv("ZENDFI_API_KEY")
         if not self.api_key:
@@ -290,6 +334,7 @@ class ZendFiClient:
         self.debug = debug
         self.timeout = timeout
         self.max_retries = max_retries
+        self.max_connections = max_connections
         
         self.base_url = self.BASE_URL
         
@@ -299,8 +344,13 @@ class ZendFiClient:
         self._session_wallet: Optional[str] = None
         self._session_agent_id: Optional[str] = None
         
-        # HTTP client (lazy initialized)
-        self._http_client: Optional[httpx.AsyncClient] = None
+        # HTTP clients (lazy initialized), one per event loop: httpx
+        # connections belong to the loop they were opened on, and sync tool
+        # calls from different threads each run on their own loop
+        self._http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._http_clients_lock = threading.Lock()
         
         # Session Keys and Autonomy managers (lazy initialized)
         self._session_keys_manager = None
@@ -311,20 +361,40 @@ class ZendFiClient:
             print(f"[ZendFi] Base URL: {self.base_url}")
     
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client."""
-        if self._http_client is None or self._http_client.is_closed:
-            self._http_client = httpx.AsyncClient(
-                base_url=self.base_url,
-                timeout=self.timeout,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                    "User-Agent": f"langchain-zendfi/{SDK_VERSION}",
-                    "X-ZendFi-SDK": f"langchain-python/{SDK_VERSION}",
-                },
-            )
-        return self._http_client
+        """Get or create the async HTTP client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.get(loop)
+            if client is None or client.is_closed:
+                # Clients left on closed loops can neither be used nor
+                # closed; drop them so their sockets go when collected.
+                # Clients on other live loops may have requests in flight.
+                for stale in [other for other in self._http_clients if other.is_closed()]:
+                    del self._http_clients[stale]
+                client = self._http_clients[loop] = self._new_http_client()
+        return client
+    
+    def _new_http_client(self) -> httpx.AsyncClient:
+        """Build a pooled HTTP client for one event loop."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            # Keep connections warm between tool calls; with HTTP/2,
+            # concurrent requests also share a single connection
+            http2=HAS_HTTP2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=300,
+            ),
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "User-Agent": f"langchain-zendfi/{SDK_VERSION}",
+                "X-ZendFi-SDK": f"langchain-python/{SDK_VERSION}",
+            },
+        )
     
     async def _request(
         self,
@@ -359,7 +429,11 @@ class ZendFiClient:
                 if method.upper() == "GET":
                     response = await client.get(endpoint, headers=headers)
                 elif method.upper() == "POST":
-                    response = await client.post(endpoint, json=data, headers=headers)
+                    response = await client.post(
+                        endpoint,
+                        content=_json_dumps(data) if data is not None else None,
+                        headers=headers,
+                    )
                 elif method.upper() == "DELETE":
                     response = await client.delete(endpoint, headers=headers)
                 else:
@@ -373,8 +447,8 @@ class ZendFiClient:
                     await self._handle_error_response(response, endpoint)
                 
                 # Parse successful response
-                if response.text:
-                    return response.json()
+                if response.content:
+                    return _json_loads(response.content)
                 return {}
                 
             except (httpx.TimeoutException, httpx.ConnectError) as e:
@@ -425,10 +499,29 @@ class ZendFiClient:
             raise ZendFiAPIError(message, status, error_code, details)
     
     async def close(self) -> None:
-        """Close the HTTP client."""
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        """Close the HTTP clients on every event loop and the session keys manager."""
+        with self._http_clients_lock:
+            clients = list(self._http_clients.items())
+            self._http_clients.clear()
+        current = asyncio.get_running_loop()
+        for loop, client in clients:
+            if loop.is_closed():
+                continue  # Nothing can run on it any more
+            if loop is not current and loop.is_running():
+                # Live in another thread: close it there
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+                )
+            else:
+                await client.aclose()
+        if self._session_keys_manager is not None:
+            await self._session_keys_manager.close()
+    
+    async def __aenter__(self) -> "ZendFiClient":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
     
     # ============================================
     # Session Keys Manager (Device-Bound)
@@ -702,7 +795,7 @@ class ZendFiClient:
             >>> print(f"Signature: {result.transaction_signature}")
         """
         if not idempotency_key:
-            idempotency_key = f"pay_{uuid.uuid4().hex[:16]}"
+            idempotency_key = f"pay_{os.urandom(8).hex()}"
         
         # Use cached session token if available
         if not session_token and self._cached_session:
@@ -751,6 +844,52 @@ class ZendFiClient:
         
         return result
     
+    async def smart_payment_many(
+        self,
+        payments: List[Dict[str, Any]],
+        return_exceptions: bool = False,
+        max_concurrency: Optional[int] = 8,
+    ) -> List[Union[SmartPaymentResult, BaseException]]:
+        """
+        Execute several smart payments concurrently.
+        
+        The API has no batch endpoint, so each payment is its own request
+        (with its own idempotency key); they are sent together over the
+        shared connection pool instead of one after another.
+        
+        Args:
+            payments: Keyword arguments for smart_payment(), one dict per
+                payment (agent_id, user_wallet, amount_usd, description, ...)
+            return_exceptions: Return failures in place instead of raising
+                the first one (the other payments are sent either way)
+            max_concurrency: Most payments in flight at once, to stay
+                under API rate limits (None for no limit)
+            
+        Returns:
+            SmartPaymentResult (or exception) for each payment, in order
+            
+        Example:
+            >>> results = await client.smart_payment_many([
+            ...     {"agent_id": "shopping-agent", "user_wallet": "7xKNH...",
+            ...      "amount_usd": 0.05, "description": "Token pack 1"},
+            ...     {"agent_id": "shopping-agent", "user_wallet": "7xKNH...",
+            ...      "amount_usd": 0.05, "description": "Token pack 2"},
+            ... ])
+        """
+        if max_concurrency is None:
+            pay = self.smart_payment
+        else:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            
+            async def pay(**payment: Any) -> SmartPaymentResult:
+                async with semaphore:
+                    return await self.smart_payment(**payment)
+        
+        return list(await asyncio.gather(
+            *(pay(**payment) for payment in payments),
+            return_exceptions=return_exceptions,
+        ))
+    
     async def submit_signed_payment(
         self,
         payment_id: str,
@@ -974,6 +1113,8 @@ class ZendFiClient:
         service_type: str,
         max_price: Optional[float] = None,
         min_reputation: float = 0.0,
+        sort_by: str = "price_asc",
+        limit: Optional[int] = None,
     ) -> List[AgentProvider]:
         """
         Search for service providers in the agent marketplace.
@@ -985,12 +1126,25 @@ class ZendFiClient:
             service_type: Type of service (e.g., 'gpt4-tokens', 'image-generation')
             max_price: Maximum price per unit filter
             min_reputation: Minimum reputation score (0-5)
+            sort_by: 'price_asc' (default), 'price_desc' or 'reputation_desc'
+            limit: Maximum number of providers to return
             
         Returns:
-            List of matching providers sorted by price
+            List of matching providers in sort_by order
         """
+        if sort_by not in MARKETPLACE_SORT_ORDERS:
+            raise ValueError(
+                f"sort_by must be one of {', '.join(MARKETPLACE_SORT_ORDERS)}, got {sort_by!r}"
+            )
+        
+        # sort_by and limit let the registry trim the response; the same
+        # ordering and cut are applied below for backends that ignore them
+        query = {"service_type": service_type, "sort_by": sort_by}
+        if limit is not None:
+            query["limit"] = limit
+        
         try:
-            response = await self._request("GET", f"/api/v1/marketplace/providers?service_type={service_type}")
+            response = await self._request("GET", f"/api/v1/marketplace/providers?{urlencode(query)}")
             
             providers = []
             for item in response.get("providers", []):
@@ -1015,9 +1169,9 @@ class ZendFiClient:
                 
                 providers.append(provider)
             
-            # Sort by price
-            providers.sort(key=lambda p: p.price_per_unit)
-            return providers
+            sort_key, reverse = MARKETPLACE_SORT_ORDERS[sort_by]
+            providers.sort(key=sort_key, reverse=reverse)
+            return providers if limit is None else providers[:limit]
             
         except ZendFiAPIError as e:
             # If marketplace API returns 404, it may not be enabled
@@ -17,12 +17,16 @@ Requires: pynacl, cryptography
 """
 
 import os
+import re
 import base64
+import binascii
 import hashlib
+import hmac
 import secrets
 import platform
 import uuid
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Optional, Tuple
 from datetime import datetime
 
@@ -85,22 +89,42 @@ class EncryptedSessionKey:
 
 @dataclass
 class SessionKeypair:
-    """Ed25519 keypair for Solana signing."""
+    """
+    Ed25519 keypair for Solana signing.
+    
+    The PyNaCl SigningKey is built once from the seed and reused for every
+    signature, so the key expansion is not repeated per sign() call.
+    
+    The secret key is held in a bytearray so release() can overwrite it
+    in place instead of leaving the seed on the heap until GC.
+    """
     public_key: str  # Base58 encoded
-    secret_key: bytes  # 64-byte Ed25519 secret key
+    secret_key: bytearray  # 64-byte Ed25519 secret key
     signing_key: Optional[object] = None  # PyNaCl SigningKey
     
+    def __post_init__(self) -> None:
+        if not isinstance(self.secret_key, bytearray):
+            self.secret_key = bytearray(self.secret_key)
+        if self.signing_key is None and HAS_NACL:
+            self.signing_key = SigningKey(bytes(self.secret_key[:32]))
+    
     def sign(self, message: bytes) -> bytes:
         """Sign a message with this keypair."""
-        if not HAS_NACL:
-            raise ImportError("PyNaCl required for signing. Install with: pip install pynacl")
-        if self.signing_key is None:
-            self.signing_key = SigningKey(self.secret_key[:32])
-        return self.signing_key.sign(message).signature
+        signing_key = self.signing_key
+        if signing_key is None:
+            if not HAS_NACL:
+                raise ImportError("PyNaCl required for signing. Install with: pip install pynacl")
+            raise ValueError("Keypair has been released and can no longer sign")
+        return signing_key.sign(message).signature
+    
+    def release(self) -> None:
+        """Zero the secret key and drop the signer so this keypair can no longer sign."""
+        self.secret_key[:] = bytes(len(self.secret_key))
+        self.signing_key = None
     
     def sign_base64(self, message: bytes) -> str:
         """Sign a message and return base64-encoded signature."""
-        return base64.b64encode(self.sign(message)).decode()
+        return binascii.b2a_base64(self.sign(message), newline=False).decode("ascii")
 
 
 # ============================================
@@ -254,7 +278,7 @@ def generate_keypair() -> SessionKeypair:
     verify_key = signing_key.verify_key
     
     # Solana uses 64-byte secret key format: [32-byte seed][32-byte public key]
-    secret_key = bytes(signing_key) + bytes(verify_key)
+    secret_key = bytearray(bytes(signing_key) + bytes(verify_key))
     
     # Base58 encode the public key (Solana format)
     public_key = base58_encode(bytes(verify_key))
@@ -283,13 +307,13 @@ def keypair_from_secret(secret_key: bytes) -> SessionKeypair:
         raise ValueError(f"Secret key must be 64 bytes, got {len(secret_key)}")
     
     # First 32 bytes are the seed
-    signing_key = SigningKey(secret_key[:32])
+    signing_key = SigningKey(bytes(secret_key[:32]))
     verify_key = signing_key.verify_key
     public_key = base58_encode(bytes(verify_key))
     
     return SessionKeypair(
         public_key=public_key,
-        secret_key=secret_key,
+        secret_key=bytearray(secret_key),
         signing_key=signing_key,
     )
 
@@ -298,6 +322,23 @@ def keypair_from_secret(secret_key: bytes) -> SessionKeypair:
 # Encryption (PBKDF2 + AES-256-GCM)
 # ============================================
 
+# Exactly six ASCII digits. str.isdigit() would also accept non-ASCII
+# digits such as Devanagari or Arabic-Indic numerals.
+_PIN_RE = re.compile(r"\A[0-9]{6}\Z")
+
+
+def _validate_pin(pin: str) -> None:
+    """Raise ValueError unless the PIN is exactly 6 ASCII digits."""
+    if not _PIN_RE.match(pin or ""):
+        raise ValueError("PIN must be exactly 6 numeric digits")
+
+
+@lru_cache(maxsize=8)
+def _fingerprint_salt(device_fingerprint: str) -> bytes:
+    """PBKDF2 salt for a device: SHA-256 of its fingerprint."""
+    return hashlib.sha256(device_fingerprint.encode()).digest()
+
+
 class SessionKeyCrypto:
     """
     Encrypt/decrypt session keys with PIN + device fingerprint.
@@ -335,8 +376,7 @@ class SessionKeyCrypto:
             )
         
         # Validate PIN
-        if not pin or not pin.isdigit() or len(pin) != 6:
-            raise ValueError("PIN must be exactly 6 numeric digits")
+        _validate_pin(pin)
         
         # Derive encryption key
         encryption_key = cls._derive_key(pin, device_fingerprint)
@@ -362,6 +402,7 @@ class SessionKeyCrypto:
         encrypted: EncryptedSessionKey,
         pin: str,
         device_fingerprint: str,
+        encryption_key: Optional[bytes] = None,
     ) -> SessionKeypair:
         """
         Decrypt an encrypted session key with PIN + device fingerprint.
@@ -370,6 +411,8 @@ class SessionKeyCrypto:
             encrypted: The EncryptedSessionKey from storage
             pin: 6-digit numeric PIN (same as used for encryption)
             device_fingerprint: Device fingerprint (must match)
+            encryption_key: Key already derived from this PIN and
+                fingerprint, e.g. while the blob was being fetched
             
         Returns:
             SessionKeypair ready for signing
@@ -383,17 +426,19 @@ class SessionKeyCrypto:
             )
         
         # Validate PIN
-        if not pin or not pin.isdigit() or len(pin) != 6:
-            raise ValueError("PIN must be exactly 6 numeric digits")
+        _validate_pin(pin)
         
-        # Verify device fingerprint
-        if encrypted.device_fingerprint != device_fingerprint:
+        # Verify device fingerprint (constant-time, no early exit on first mismatch)
+        if not hmac.compare_digest(
+            encrypted.device_fingerprint.encode(), device_fingerprint.encode()
+        ):
             raise ValueError(
                 "Device fingerprint mismatch - wrong device or security threat"
             )
         
         # Derive encryption key
-        encryption_key = cls._derive_key(pin, device_fingerprint)
+        if encryption_key is None:
+            encryption_key = cls._derive_key(pin, device_fingerprint)
         
         # Decode base64
         encrypted_data = base64.b64decode(encrypted.encrypted_data)
@@ -415,19 +460,25 @@ class SessionKeyCrypto:
         """
         Derive encryption key from PIN + device fingerprint using PBKDF2.
         
-        Uses SHA-256 hash of device fingerprint as salt.
+        Uses SHA-256 hash of device fingerprint as salt. The whole stretch
+        runs inside OpenSSL in a single call; the iteration count and salt
+        must stay in step with the TypeScript SDK so keys remain portable.
+        The encoded PIN is held in a mutable buffer and zeroed once the key
+        has been derived.
         """
-        salt = hashlib.sha256(device_fingerprint.encode()).digest()
-        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=cls.KEY_LENGTH,
-            salt=salt,
+            salt=_fingerprint_salt(device_fingerprint),
             iterations=cls.PBKDF2_ITERATIONS,
             backend=default_backend(),
         )
         
-        return kdf.derive(pin.encode())
+        pin_buf = bytearray(pin.encode())
+        try:
+            return kdf.derive(pin_buf)
+        finally:
+            pin_buf[:] = bytes(len(pin_buf))
 
 
 # ============================================
@@ -15,9 +15,14 @@ Compatible with TypeScript SDK's aip/session-keys.ts
 
 import asyncio
 import base64
+import binascii
+import functools
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Callable, Awaitable
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
 
 from langchain_zendfi.crypto import (
     DeviceFingerprintGenerator,
@@ -31,6 +36,7 @@ from langchain_zendfi.crypto import (
     LitEncryptionResult,
     HAS_NACL,
     HAS_CRYPTOGRAPHY,
+    _validate_pin,
 )
 
 
@@ -80,6 +86,27 @@ class SessionKeyResult:
     
     def to_dict(self) -> dict:
         return asdict(self)
+    
+    @classmethod
+    def from_response(
+        cls,
+        response: Dict[str, Any],
+        options: CreateSessionKeyOptions,
+        session_wallet: str,
+        recovery_qr: Optional[str] = None,
+    ) -> "SessionKeyResult":
+        """Build from a create response, falling back to the request options."""
+        get = response.get
+        return cls(
+            session_key_id=response["session_key_id"],
+            agent_id=get("agent_id", options.agent_id),
+            session_wallet=get("session_wallet", session_wallet),
+            limit_usdc=get("limit_usdc", options.limit_usdc),
+            expires_at=get("expires_at", ""),
+            cross_app_compatible=get("cross_app_compatible", True),
+            agent_name=get("agent_name"),
+            recovery_qr=recovery_qr,
+        )
 
 
 @dataclass
@@ -96,6 +123,21 @@ class SessionKeyInfo:
     
     def to_dict(self) -> dict:
         return asdict(self)
+    
+    @classmethod
+    def from_response(cls, session_key_id: str, response: Dict[str, Any]) -> "SessionKeyInfo":
+        """Build from a status response, defaulting missing fields."""
+        get = response.get
+        return cls(
+            session_key_id=session_key_id,
+            is_active=get("is_active", False),
+            is_approved=get("is_approved", False),
+            limit_usdc=get("limit_usdc", 0),
+            used_amount_usdc=get("used_amount_usdc", 0),
+            remaining_usdc=get("remaining_usdc", 0),
+            expires_at=get("expires_at", ""),
+            days_until_expiry=get("days_until_expiry", 0),
+        )
 
 
 @dataclass
@@ -107,6 +149,16 @@ class PaymentResult:
     
     def to_dict(self) -> dict:
         return asdict(self)
+    
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> "PaymentResult":
+        """Build from a payment response, defaulting missing fields."""
+        get = response.get
+        return cls(
+            payment_id=get("payment_id", ""),
+            signature=get("signature", ""),
+            status=get("status", "pending"),
+        )
 
 
 # ============================================
@@ -139,15 +191,38 @@ class DeviceBoundSessionKey:
         signature = session_key.sign(message)
     """
     
+    # Session managers keep one of these per key and touch them on every
+    # sign, so skip the per-instance __dict__
+    __slots__ = (
+        "_keypair",
+        "_encrypted",
+        "_device_fingerprint",
+        "_session_key_id",
+        "_request_data_cache",
+        "_cached_keypair",
+        "_unlocked_until",
+        "agent_id",
+        "agent_name",
+        "user_wallet",
+    )
+    
     def __init__(self):
         self._keypair: Optional[SessionKeypair] = None
         self._encrypted: Optional[EncryptedSessionKey] = None
         self._device_fingerprint: Optional[str] = None
         self._session_key_id: Optional[str] = None
         
-        # Cached unlocked keypair (in memory)
+        # Backend fields derived from the encrypted blob, built once
+        self._request_data_cache: Optional[Dict[str, Any]] = None
+        
+        # Cached unlocked keypair (in memory), valid until a time.monotonic() deadline
         self._cached_keypair: Optional[SessionKeypair] = None
-        self._cache_expires_at: Optional[datetime] = None
+        self._unlocked_until: float = 0.0
+        
+        # Metadata reported by the backend (set by SessionKeysManager)
+        self.agent_id: Optional[str] = None
+        self.agent_name: Optional[str] = None
+        self.user_wallet: Optional[str] = None
     
     @classmethod
     async def create(
@@ -157,6 +232,7 @@ class DeviceBoundSessionKey:
         duration_days: int,
         user_wallet: str,
         generate_recovery_qr: bool = False,
+        executor: Optional[Executor] = None,
     ) -> "DeviceBoundSessionKey":
         """
         Create a new device-bound session key.
@@ -167,6 +243,8 @@ class DeviceBoundSessionKey:
             duration_days: Duration in days (1-30)
             user_wallet: User's main wallet address
             generate_recovery_qr: Whether to generate recovery QR
+            executor: Where to run the PIN encryption (default: the
+                loop's default executor)
             
         Returns:
             DeviceBoundSessionKey instance
@@ -187,11 +265,17 @@ class DeviceBoundSessionKey:
         keypair = generate_keypair()
         instance._keypair = keypair
         
-        # Encrypt keypair with PIN + device fingerprint
-        encrypted = SessionKeyCrypto.encrypt(
-            keypair=keypair,
-            pin=pin,
-            device_fingerprint=device_fp.fingerprint,
+        # Encrypt keypair with PIN + device fingerprint. The PBKDF2 key
+        # derivation takes tens of milliseconds of CPU, so keep it off the
+        # event loop.
+        encrypted = await asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(
+                SessionKeyCrypto.encrypt,
+                keypair=keypair,
+                pin=pin,
+                device_fingerprint=device_fp.fingerprint,
+            ),
         )
         instance._encrypted = encrypted
         
@@ -203,6 +287,23 @@ class DeviceBoundSessionKey:
             raise ValueError("Session key not initialized")
         return self._encrypted
     
+    def get_request_data(self) -> Dict[str, Any]:
+        """
+        Get the encrypted key fields of a backend create request.
+        
+        Built on first use and reused afterwards, so retries don't redo
+        the work. Callers merge their per-call fields into a copy.
+        """
+        if self._request_data_cache is None:
+            encrypted = self.get_encrypted_data()
+            self._request_data_cache = {
+                "encrypted_session_key": encrypted.encrypted_data,
+                "nonce": encrypted.nonce,
+                "session_public_key": encrypted.public_key,
+                "device_fingerprint": self.get_device_fingerprint(),
+            }
+        return self._request_data_cache
+    
     def get_device_fingerprint(self) -> str:
         """Get the device fingerprint."""
         if self._device_fingerprint is None:
@@ -236,11 +337,7 @@ class DeviceBoundSessionKey:
     
     def is_cached(self) -> bool:
         """Check if the keypair is cached (unlocked) and not expired."""
-        if self._cached_keypair is None:
-            return False
-        if self._cache_expires_at is None:
-            return False
-        return datetime.now() < self._cache_expires_at
+        return self._cached_keypair is not None and time.monotonic() < self._unlocked_until
     
     def unlock_with_pin(
         self,
@@ -272,15 +369,18 @@ class DeviceBoundSessionKey:
         
         # Cache it
         self._cached_keypair = keypair
-        self._cache_expires_at = datetime.now() + timedelta(minutes=cache_ttl_minutes)
+        self._unlocked_until = time.monotonic() + cache_ttl_minutes * 60
         
         return keypair
     
     def lock(self) -> None:
         """Clear the cached keypair and raw keypair."""
+        for keypair in (self._keypair, self._cached_keypair):
+            if keypair is not None:
+                keypair.release()
         self._keypair = None  # Clear raw keypair too
         self._cached_keypair = None
-        self._cache_expires_at = None
+        self._unlocked_until = 0.0
     
     def get_keypair(self, pin: Optional[str] = None) -> SessionKeypair:
         """
@@ -294,9 +394,10 @@ class DeviceBoundSessionKey:
         Returns:
             SessionKeypair for signing
         """
-        # Check cache first
-        if self.is_cached() and self._cached_keypair is not None:
-            return self._cached_keypair
+        # Check cache first (is_cached() inlined: this runs on every sign)
+        cached = self._cached_keypair
+        if cached is not None and time.monotonic() < self._unlocked_until:
+            return cached
         
         # If we have the raw keypair (just created), use it
         if self._keypair is not None:
@@ -325,6 +426,24 @@ class DeviceBoundSessionKey:
         keypair = self.get_keypair(pin)
         return keypair.sign(message)
     
+    def sign_many(self, messages: List[bytes], pin: Optional[str] = None) -> List[bytes]:
+        """
+        Sign several messages with one keypair lookup.
+        
+        Signatures are plain 64-byte Ed25519 signatures in the same order
+        as `messages`, so verifiers can check them one by one or pass
+        (message, signature, public key) triples to a batch verifier.
+        
+        Args:
+            messages: Message bytes to sign
+            pin: PIN to decrypt (only required if not cached)
+            
+        Returns:
+            List of 64-byte Ed25519 signatures
+        """
+        sign = self.get_keypair(pin).sign
+        return [sign(message) for message in messages]
+    
     def sign_base64(self, message: bytes, pin: Optional[str] = None) -> str:
         """
         Sign a message and return base64-encoded signature.
@@ -336,13 +455,42 @@ class DeviceBoundSessionKey:
         Returns:
             Base64-encoded signature string
         """
-        return base64.b64encode(self.sign(message, pin)).decode()
+        return binascii.b2a_base64(self.sign(message, pin), newline=False).decode("ascii")
 
 
 # ============================================
 # Session Keys Manager
 # ============================================
 
+class _SessionKeyStore(OrderedDict):
+    """
+    Loaded session keys, least recently used first.
+    
+    Holds at most `maxsize` keys. Keys pushed out (evicted or replaced)
+    are locked so their plaintext is wiped rather than left to GC.
+    """
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, session_key_id, default=None):
+        session_key = super().get(session_key_id, default)
+        if session_key is not default:
+            self.move_to_end(session_key_id)
+        return session_key
+    
+    def __setitem__(self, session_key_id, session_key) -> None:
+        previous = super().get(session_key_id)
+        if previous is not None and previous is not session_key:
+            previous.lock()
+        super().__setitem__(session_key_id, session_key)
+        self.move_to_end(session_key_id)
+        while len(self) > self.maxsize:
+            _, evicted = self.popitem(last=False)
+            evicted.lock()
+
+
 # Type for the HTTP request function
 RequestFn = Callable[[str, str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
 
@@ -381,18 +529,41 @@ class SessionKeysManager:
         )
     """
     
-    def __init__(self, request_fn: RequestFn, debug: bool = False):
+    def __init__(
+        self,
+        request_fn: RequestFn,
+        debug: bool = False,
+        max_session_keys: int = 256,
+    ):
         self._request = request_fn
         self._debug = debug
         
-        # Local storage for session keys
-        self._session_keys: Dict[str, DeviceBoundSessionKey] = {}
-        self._session_metadata: Dict[str, Dict[str, Any]] = {}
+        # Local storage for session keys, bounded so long-lived agents that
+        # churn through keys don't grow without limit
+        self._session_keys: Dict[str, DeviceBoundSessionKey] = _SessionKeyStore(max_session_keys)
+        
+        # Worker threads for blocking calls (Lit Protocol), created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
     
-    def _log(self, *args) -> None:
-        """Debug logging."""
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the worker pool for blocking calls."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2,
+                thread_name_prefix="zendfi-session-keys",
+            )
+        return self._executor
+    
+    async def close(self) -> None:
+        """Shut down the worker pool. In-flight calls are left to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    def _log(self, fmt: str, *args: Any) -> None:
+        """Debug logging. `fmt` is %-formatted with `args` only when debug is on."""
         if self._debug:
-            print("[ZendFi SessionKeys]", *args)
+            print("[ZendFi SessionKeys]", fmt % args if args else fmt)
     
     async def create(self, options: CreateSessionKeyOptions) -> SessionKeyResult:
         """
@@ -407,10 +578,10 @@ class SessionKeysManager:
         Returns:
             SessionKeyResult with session key ID and wallet
         """
-        if not options.pin or len(options.pin) < 4:
-            raise ValueError("PIN must be at least 4 characters")
+        # Fail fast with the same rule SessionKeyCrypto enforces
+        _validate_pin(options.pin)
         
-        self._log(f"Creating session key for agent: {options.agent_id}")
+        self._log("Creating session key for agent: %s", options.agent_id)
         
         # Create device-bound session key (client-side)
         session_key = await DeviceBoundSessionKey.create(
@@ -419,28 +590,31 @@ class SessionKeysManager:
             duration_days=options.duration_days,
             user_wallet=options.user_wallet,
             generate_recovery_qr=options.generate_recovery_qr,
+            executor=self._get_executor(),
         )
         
         # Get encrypted data
         encrypted = session_key.get_encrypted_data()
         
-        self._log(f"Session wallet: {encrypted.public_key[:8]}...")
+        self._log("Session wallet: %.8s...", encrypted.public_key)
         
         # Encrypt with Lit Protocol for autonomous signing (if enabled)
-        # NOTE: Lit Protocol can take 2-5 minutes due to network latency
-        lit_encryption: Optional[LitEncryptionResult] = None
+        # NOTE: Lit Protocol can take 2-5 minutes due to network latency.
+        # encrypt_keypair_with_lit is blocking, so run it on the manager's
+        # worker pool and keep the event loop free meanwhile.
+        lit_task: Optional["asyncio.Future[Optional[LitEncryptionResult]]"] = None
         if options.enable_lit_protocol:
             self._log("Encrypting session key with Lit Protocol (may take 2-5 min)...")
             keypair = session_key.get_keypair()
             if keypair:
-                lit_encryption = encrypt_keypair_with_lit(
-                    keypair=keypair,
-                    network=options.lit_network,
+                lit_task = asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(),
+                    functools.partial(
+                        encrypt_keypair_with_lit,
+                        keypair=keypair,
+                        network=options.lit_network,
+                    ),
                 )
-                if lit_encryption:
-                    self._log("✓ Lit Protocol encryption successful - autonomous signing enabled")
-                else:
-                    self._log("⚠ Lit Protocol encryption failed/timeout - using client signing fallback")
             else:
                 self._log("⚠ Cannot get keypair for Lit encryption - session key may be locked")
         else:
@@ -454,6 +628,16 @@ class SessionKeysManager:
                 f"{encrypted.public_key}:{encrypted.nonce}".encode()
             ).decode()
         
+        # The create endpoint stores the Lit ciphertext alongside the key,
+        # so the result is needed before the backend call
+        lit_encryption: Optional[LitEncryptionResult] = None
+        if lit_task is not None:
+            lit_encryption = await lit_task
+            if lit_encryption:
+                self._log("✓ Lit Protocol encryption successful - autonomous signing enabled")
+            else:
+                self._log("⚠ Lit Protocol encryption failed/timeout - using client signing fallback")
+        
         # Prepare backend request
         request_data = {
             "user_wallet": options.user_wallet,
@@ -461,10 +645,7 @@ class SessionKeysManager:
             "agent_name": options.agent_name or f"LangChain Agent ({options.agent_id})",
             "limit_usdc": options.limit_usdc,
             "duration_days": options.duration_days,
-            "encrypted_session_key": encrypted.encrypted_data,
-            "nonce": encrypted.nonce,
-            "session_public_key": encrypted.public_key,
-            "device_fingerprint": session_key.get_device_fingerprint(),
+            **session_key.get_request_data(),
             "recovery_qr_data": recovery_qr,
             # Lit Protocol encryption (for autonomous signing)
             "lit_encrypted_keypair": lit_encryption.ciphertext if lit_encryption else None,
@@ -485,10 +666,10 @@ class SessionKeysManager:
         # CRITICAL: Check if backend returned an existing session key
         # If so, the session_wallet won't match our locally generated keypair
         if backend_session_wallet and backend_session_wallet != local_public_key:
-            self._log(f"⚠ Backend returned existing session key (different wallet)")
-            self._log(f"  Backend: {backend_session_wallet[:16]}...")
-            self._log(f"  Local:   {local_public_key[:16]}...")
-            self._log(f"  → You must load the existing session key with PIN, or use a unique agent_id")
+            self._log("⚠ Backend returned existing session key (different wallet)")
+            self._log("  Backend: %.16s...", backend_session_wallet)
+            self._log("  Local:   %.16s...", local_public_key)
+            self._log("  → You must load the existing session key with PIN, or use a unique agent_id")
             
             # Don't store the local keypair - it won't work for signing!
             # Raise an error to help the user understand the issue
@@ -500,27 +681,19 @@ class SessionKeysManager:
                 f"  2. Use a unique agent_id (e.g., '{options.agent_id}-{datetime.now().strftime('%Y%m%d%H%M%S')}')"
             )
         
-        # Store session key locally
+        # Store session key locally, with its metadata
         session_key.set_session_key_id(session_key_id)
+        session_key.agent_id = response.get("agent_id", options.agent_id)
+        session_key.agent_name = response.get("agent_name")
+        session_key.user_wallet = options.user_wallet
         self._session_keys[session_key_id] = session_key
         
-        # Store metadata
-        self._session_metadata[session_key_id] = {
-            "agent_id": response.get("agent_id", options.agent_id),
-            "agent_name": response.get("agent_name"),
-            "user_wallet": options.user_wallet,
-        }
-        
-        self._log(f"Session key created: {session_key_id[:8]}...")
+        self._log("Session key created: %.8s...", session_key_id)
         
-        return SessionKeyResult(
-            session_key_id=session_key_id,
-            agent_id=response.get("agent_id", options.agent_id),
-            session_wallet=response.get("session_wallet", encrypted.public_key),
-            limit_usdc=response.get("limit_usdc", options.limit_usdc),
-            expires_at=response.get("expires_at", ""),
-            cross_app_compatible=response.get("cross_app_compatible", True),
-            agent_name=response.get("agent_name"),
+        return SessionKeyResult.from_response(
+            response,
+            options,
+            session_wallet=encrypted.public_key,
             recovery_qr=recovery_qr,
         )
     
@@ -528,14 +701,21 @@ class SessionKeysManager:
         """
         Load an existing session key from backend.
         
-        Fetches the encrypted session key and decrypts it with your PIN.
-        Use this when resuming a session on the same device.
+        Fetches the encrypted session key. Use this when resuming a session
+        on the same device.
+        
+        When the backend reports the session public key, nothing is
+        decrypted here and a wrong PIN surfaces on the first unlock() or
+        sign(). Otherwise the blob is decrypted with your PIN to recover
+        the public key, which also verifies the PIN up front.
         
         Args:
             session_key_id: UUID of the session key
             pin: PIN to decrypt the session key
         """
-        self._log(f"Loading session key: {session_key_id[:8]}...")
+        _validate_pin(pin)
+        
+        self._log("Loading session key: %.8s...", session_key_id)
         
         # Get current device fingerprint
         device_fp = DeviceFingerprintGenerator.generate()
@@ -560,13 +740,28 @@ class SessionKeysManager:
         encrypted = EncryptedSessionKey(
             encrypted_data=response["encrypted_session_key"],
             nonce=response["nonce"],
-            public_key="",  # Will be set after decryption
+            public_key=response.get("session_public_key") or "",
             device_fingerprint=device_fp.fingerprint,
         )
         
-        # Decrypt to verify PIN
-        keypair = SessionKeyCrypto.decrypt(encrypted, pin, device_fp.fingerprint)
-        encrypted.public_key = keypair.public_key
+        # Public key known: skip the decrypt, PIN is checked on unlock
+        if not encrypted.public_key:
+            # Decrypt just to learn the public key (also verifies PIN). The
+            # PBKDF2 derive runs on the worker pool to keep the loop free.
+            encryption_key = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                SessionKeyCrypto._derive_key,
+                pin,
+                device_fp.fingerprint,
+            )
+            keypair = SessionKeyCrypto.decrypt(
+                encrypted,
+                pin,
+                device_fp.fingerprint,
+                encryption_key=encryption_key,
+            )
+            encrypted.public_key = keypair.public_key
+            keypair.release()
         
         # Create session key instance
         session_key = DeviceBoundSessionKey()
@@ -577,7 +772,7 @@ class SessionKeysManager:
         # Store locally
         self._session_keys[session_key_id] = session_key
         
-        self._log(f"Session key loaded: {session_key_id[:8]}...")
+        self._log("Session key loaded: %.8s...", session_key_id)
     
     def unlock(
         self,
@@ -603,7 +798,7 @@ class SessionKeysManager:
             )
         
         session_key.unlock_with_pin(pin, cache_ttl_minutes)
-        self._log(f"Session key unlocked: {session_key_id[:8]}...")
+        self._log("Session key unlocked: %.8s...", session_key_id)
     
     def lock(self, session_key_id: str) -> None:
         """
@@ -615,7 +810,7 @@ class SessionKeysManager:
         session_key = self._session_keys.get(session_key_id)
         if session_key:
             session_key.lock()
-            self._log(f"Session key locked: {session_key_id[:8]}...")
+            self._log("Session key locked: %.8s...", session_key_id)
     
     def get_keypair(
         self,
@@ -661,6 +856,29 @@ class SessionKeysManager:
         
         return session_key.sign(message, pin)
     
+    def sign_many(
+        self,
+        session_key_id: str,
+        messages: List[bytes],
+        pin: Optional[str] = None,
+    ) -> List[bytes]:
+        """
+        Sign several messages with a session key.
+        
+        Args:
+            session_key_id: UUID of the session key
+            messages: Messages to sign
+            pin: PIN if not unlocked
+            
+        Returns:
+            64-byte Ed25519 signatures, in message order
+        """
+        session_key = self._session_keys.get(session_key_id)
+        if session_key is None:
+            raise ValueError(f"Session key {session_key_id[:8]}... not loaded.")
+        
+        return session_key.sign_many(messages, pin)
+    
     def sign_delegation(
         self,
         session_key_id: str,
@@ -710,16 +928,21 @@ class SessionKeysManager:
             {"session_key_id": session_key_id},
         )
         
-        return SessionKeyInfo(
-            session_key_id=session_key_id,
-            is_active=response.get("is_active", False),
-            is_approved=response.get("is_approved", False),
-            limit_usdc=response.get("limit_usdc", 0),
-            used_amount_usdc=response.get("used_amount_usdc", 0),
-            remaining_usdc=response.get("remaining_usdc", 0),
-            expires_at=response.get("expires_at", ""),
-            days_until_expiry=response.get("days_until_expiry", 0),
-        )
+        return SessionKeyInfo.from_response(session_key_id, response)
+    
+    async def get_status_many(self, session_key_ids: List[str]) -> List[SessionKeyInfo]:
+        """
+        Get the status of several session keys concurrently.
+        
+        Args:
+            session_key_ids: UUIDs of the session keys
+            
+        Returns:
+            SessionKeyInfo for each ID, in the same order
+        """
+        return list(await asyncio.gather(
+            *(self.get_status(session_key_id) for session_key_id in session_key_ids)
+        ))
     
     async def make_payment(
         self,
@@ -754,11 +977,29 @@ class SessionKeysManager:
             },
         )
         
-        return PaymentResult(
-            payment_id=response.get("payment_id", ""),
-            signature=response.get("signature", ""),
-            status=response.get("status", "pending"),
-        )
+        return PaymentResult.from_response(response)
+    
+    async def make_payment_many(
+        self,
+        payments: List[Dict[str, Any]],
+        return_exceptions: bool = False,
+    ) -> List[Union[PaymentResult, BaseException]]:
+        """
+        Make several session key payments concurrently.
+        
+        Args:
+            payments: Keyword arguments for make_payment(), one dict per
+                payment (session_key_id, amount, recipient, description)
+            return_exceptions: Return failures in place instead of raising
+                the first one (the other payments are sent either way)
+            
+        Returns:
+            PaymentResult (or exception) for each payment, in the same order
+        """
+        return list(await asyncio.gather(
+            *(self.make_payment(**payment) for payment in payments),
+            return_exceptions=return_exceptions,
+        ))
     
     async def revoke(self, session_key_id: str) -> None:
         """
@@ -776,10 +1017,11 @@ class SessionKeysManager:
         )
         
         # Clear local state
-        self._session_keys.pop(session_key_id, None)
-        self._session_metadata.pop(session_key_id, None)
+        session_key = self._session_keys.pop(session_key_id, None)
+        if session_key is not None:
+            session_key.lock()
         
-        self._log(f"Session key revoked: {session_key_id[:8]}...")
+        self._log("Session key revoked: %.8s...", session_key_id)
     
     def get_session_wallet(self, session_key_id: str) -> str:
         """
@@ -11,6 +11,7 @@ These tools follow LangChain best practices:
 
 Tools provided:
 - ZendFiPaymentTool: Execute autonomous crypto payments
+- ZendFiBatchPaymentTool: Execute several payments in one call
 - ZendFiMarketplaceTool: Search for agent service providers
 - ZendFiBalanceTool: Check session key balance and limits
 - ZendFiCreateSessionTool: Create a new session key
@@ -18,12 +19,23 @@ Tools provided:
 - ZendFiPricingTool: Get PPP-adjusted pricing suggestions
 """
 
-from typing import Optional, Type, Any, ClassVar, List
-from pydantic import BaseModel, Field
-from langchain_core.tools import BaseTool
+from collections import OrderedDict
+from typing import Optional, Type, Any, ClassVar, Dict, List, Tuple, Callable, Awaitable, Literal
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
+from langchain_core.tools import BaseTool, BaseToolkit
 from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
+import anyio.from_thread
 import asyncio
+import atexit
+import copy
+import dataclasses
+import functools
 import os
+import sys
+import threading
+import time
+import warnings
+import weakref
 
 from langchain_zendfi.client import (
     ZendFiClient,
@@ -35,16 +47,340 @@ from langchain_zendfi.client import (
     RateLimitError,
     ValidationError,
     SessionLimits,
+    SessionKeyStatus,
+    SmartPaymentResult,
+    PPPFactor,
+    PricingSuggestion,
+    _json_dumps,
 )
 
+# Tool output: formatted text for chat, or compact JSON for programs
+OutputFormat = Literal["pretty", "json"]
+
+# Optional faster event loop for the loops this module owns
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+
+# ============================================
+# Sync/async bridge
+# ============================================
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create an event loop for sync calls, using uvloop when installed.
+    
+    Only loops owned by this module use uvloop; the global event loop
+    policy is left to the application.
+    """
+    if HAS_UVLOOP:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the event loop thread used for sync calls made inside a running loop."""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = _new_event_loop()
+            threading.Thread(
+                target=loop.run_forever,
+                name="zendfi-tools-loop",
+                daemon=True,
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
+
+# One reusable loop per calling thread for sync calls (Python 3.11+), so
+# back-to-back calls don't each build and tear down a loop, and the
+# client's keep-alive connections for that loop survive between them
+# (ZendFiClient keeps one HTTP pool per event loop)
+_thread_runners = threading.local()
+
+
+def _run_in_thread_runner(coro: Any) -> Any:
+    """Run a coroutine on this thread's reusable asyncio.Runner."""
+    runner = getattr(_thread_runners, "runner", None)
+    if runner is None:
+        runner = asyncio.Runner(loop_factory=_new_event_loop)
+        atexit.register(runner.close)
+        _thread_runners.runner = runner
+    return runner.run(coro)
+
+
+# Sync calls from inside a running loop work, but block that loop's thread
+# until the tool finishes; say so once per process
+_warned_sync_in_loop = False
+
+
+def _run_sync(fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """
+    Run an async tool method to completion from synchronous code.
+    
+    Dispatch, in order:
+    - From an AnyIO worker thread (e.g. anyio.to_thread.run_sync), hop back
+      to that thread's event loop with anyio.from_thread.run, so the call
+      keeps the caller's cancellation scope and context.
+    - With no loop running, run on this thread's reusable asyncio.Runner
+      (asyncio.run() before Python 3.11).
+    - From inside a running loop (a sync tool invoked by an async agent),
+      hand the coroutine to a background loop thread instead of trying to
+      re-enter the caller's loop. The caller's loop is still blocked while
+      it waits, so this warns once suggesting ainvoke()/_arun instead.
+    """
+    global _warned_sync_in_loop
+    try:
+        return anyio.from_thread.run(fn, *args)
+    except RuntimeError:
+        pass  # Not in an AnyIO worker thread
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        if sys.version_info >= (3, 11):
+            return _run_in_thread_runner(fn(*args))
+        return asyncio.run(fn(*args))
+    if not _warned_sync_in_loop:
+        _warned_sync_in_loop = True
+        warnings.warn(
+            "ZendFi tool called synchronously inside a running event loop; "
+            "this blocks the loop until the tool finishes. Use ainvoke() instead.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+    return asyncio.run_coroutine_threadsafe(fn(*args), _get_background_loop()).result()
+
+
+# Rating and balance bars, indexed by filled-cell count
+_STAR_BARS = tuple("⭐" * i + "☆" * (5 - i) for i in range(6))
+_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
+# Balance status indicator, keyed by SessionKeyStatus.is_active
+_STATUS_LABELS = {True: ("🟢", "Active"), False: ("🔴", "Inactive")}
+
+
+# Recent session status per client, shared by the balance and payment
+# tools: client -> (expires_at, SessionKeyStatus)
+_STATUS_TTL_S = 1.5
+_status_cache: "weakref.WeakKeyDictionary[ZendFiClient, Tuple[float, SessionKeyStatus]]" = (
+    weakref.WeakKeyDictionary()
+)
+# A confirmed payment updates a fresh cached status in place, so the balance
+# check agents usually make right after a payment is answered locally
+_PAYMENT_STATUS_TTL_S = 5.0
+
+
+def _apply_payment_to_status(client: ZendFiClient, result: SmartPaymentResult) -> None:
+    """Deduct a payment from the client's cached status, or drop a stale one."""
+    cached = _status_cache.pop(client, None)
+    if cached is None or result.status != "confirmed" or time.monotonic() >= cached[0]:
+        return
+    status = cached[1]
+    _status_cache[client] = (
+        time.monotonic() + _PAYMENT_STATUS_TTL_S,
+        dataclasses.replace(
+            status,
+            remaining_usdc=status.remaining_usdc - result.amount_usd,
+            used_amount_usdc=status.used_amount_usdc + result.amount_usd,
+        ),
+    )
+
+# PPP factors move on a monthly-or-slower cadence; keep them for a day.
+# (mode, country code) -> (expires_at, PPPFactor), shared by all clients
+_PPP_TTL_S = 24 * 60 * 60
+_ppp_cache: "dict[Tuple[str, str], Tuple[float, PPPFactor]]" = {}
+
+
+async def _get_ppp_factor_cached(client: ZendFiClient, country_code: str) -> PPPFactor:
+    """Get a country's PPP factor, from the process-wide cache when fresh."""
+    key = (str(client.mode), country_code.upper())
+    cached = _ppp_cache.get(key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    ppp = await client.get_ppp_factor(country_code)
+    _ppp_cache[key] = (time.monotonic() + _PPP_TTL_S, ppp)
+    return ppp
+
+
+@functools.lru_cache(maxsize=64)
+def _make_limits(max_per_transaction: float, max_per_day: float) -> SessionLimits:
+    """Agent session limits, with weekly/monthly caps derived from the daily one.
+
+    Instances are shared between calls; treat them as read-only.
+    """
+    return SessionLimits(
+        max_per_transaction=max_per_transaction,
+        max_per_day=max_per_day,
+        max_per_week=max_per_day * 7,
+        max_per_month=max_per_day * 30,
+    )
+
+
+# Success-path response templates (filled with str.format)
+_PAYMENT_SUCCESS_TMPL = """✅ Payment Successful!
+
+Amount: ${amount_usd:.2f} USD
+Recipient: {recipient}
+Transaction: {sig_display}
+Description: {description}
+Payment ID: {result.payment_id}
+Status: {result.status}"""
+
+_BALANCE_TMPL = """Session Key Balance
+
+{status_emoji} Status: {status_text}
+Balance: ${status.remaining_usdc:.2f} / ${status.limit_usdc:.2f} USD
+   [{progress_bar}] {pct_remaining:.0f}% remaining
+
+Spent: ${status.used_amount_usdc:.2f} USD
+Expires: {status.expires_at}
+   ({status.days_until_expiry} days remaining)
+
+Session ID: {status.session_key_id}"""
+
+_SESSION_KEY_CREATED_TMPL = """✅ Session Key Created Successfully!
+
+Session ID: {result.session_key_id}
+Session Wallet: {result.session_wallet}
+Spending Limit: ${result.limit_usdc:.2f} USD
+Expires: {result.expires_at}
+Agent ID: {result.agent_id}
+
+You can now make autonomous payments up to your spending limit.
+Use check_payment_balance to monitor your remaining balance."""
+
+_AGENT_SESSION_CREATED_TMPL = """Agent Session Created Successfully!
+
+Session ID: {result.id}
+Agent: {agent}
+Wallet: {result.user_wallet}
+Spending Limits:
+   • Per Transaction: ${limits.max_per_transaction:.2f}
+   • Per Day: ${limits.max_per_day:.2f}
+   • Per Week: ${limits.max_per_week:.2f}
+
+Expires: {result.expires_at}
+
+You can now make autonomous payments within your limits.
+Use check_payment_balance to monitor spending."""
+
+# Error-path response templates (filled with str.format)
+_ERR_UNEXPECTED = "❌ Unexpected error: {err}"
+_ERR_UNEXPECTED_PLAIN = "Unexpected error: {err}"
+
+_ERR_PAYMENT_INSUFFICIENT = """Payment Failed: Insufficient Balance
+
+You tried to pay ${amount_usd:.2f} but don't have enough funds.
+
+Tip: Use the check_payment_balance tool to see your remaining balance,
+   or create a new session key with a higher limit."""
+
+_ERR_PAYMENT_EXPIRED = """Payment Failed: Session Key Expired
+
+Your session key has expired and can no longer be used for payments.
+
+Tip: Create a new session key to continue making payments."""
+
+_ERR_PAYMENT_NO_SESSION = """Payment Failed: No Session Key
+
+No session key is configured for this agent.
+
+Tip: A session key will be created automatically on the next attempt,
+   or you can create one explicitly with specific limits."""
+
+_ERR_PAYMENT_API = """Payment Failed: {err}
+
+Please verify:
+- The recipient address is a valid Solana wallet
+- You have sufficient balance in your session key
+- Your session key hasn't expired"""
+
+_ERR_PAYMENT_UNEXPECTED = """Unexpected Error: {err}
+
+Please try again or contact support if the issue persists."""
+
+_BATCH_PAYMENT_LINE_OK = "{n}. ✅ ${amount_usd:.2f} to {recipient} ({description}) - Payment ID: {result.payment_id}"
+_BATCH_PAYMENT_LINE_FAILED = "{n}. ❌ ${amount_usd:.2f} to {recipient} ({description}) - {err}"
+
+_ERR_MARKETPLACE_API = "❌ Marketplace search failed: {err}"
+
+_ERR_BALANCE_NO_SESSION = """⚠️ No Session Key Found
+
+A session key hasn't been created yet. One will be created
+automatically when you make your first payment.
+
+Or use create_session_key to create one with custom limits."""
+
+_ERR_BALANCE_API = "❌ Failed to check balance: {err}"
+
+_ERR_CREATE_SESSION_API = "Failed to create session key: {err}"
+
+_ERR_AUTHENTICATION = """❌ Authentication Failed
+
+Your ZendFi API key is invalid or missing.
+Please check your ZENDFI_API_KEY environment variable."""
+
+_ERR_VALIDATION = """❌ Validation Error: {err}
+
+Please check your input parameters."""
+
+_ERR_NO_USER_WALLET = """❌ User wallet not configured.
+
+Please set ZENDFI_USER_WALLET environment variable or configure
+the user_wallet parameter on the tool."""
+
+_ERR_AGENT_SESSION_API = "❌ Failed to create session: {err}"
+
+_ERR_PRICING_API = "Pricing suggestion failed: {err}"
+
+# Exception type -> (JSON error code, pretty template) for tools with several
+# failure modes. Looked up along the exception's MRO, so subclasses without
+# an entry fall back to their nearest listed base; templates may use {err}
+# plus any fields the tool passes to _render_exception.
+_ErrorTable = Dict[type, Tuple[str, str]]
+
+_PAYMENT_ERRORS: _ErrorTable = {
+    InsufficientBalanceError: ("insufficient_balance", _ERR_PAYMENT_INSUFFICIENT),
+    SessionKeyExpiredError: ("session_key_expired", _ERR_PAYMENT_EXPIRED),
+    SessionKeyNotFoundError: ("session_key_not_found", _ERR_PAYMENT_NO_SESSION),
+    ZendFiAPIError: ("api_error", _ERR_PAYMENT_API),
+    Exception: ("unexpected_error", _ERR_PAYMENT_UNEXPECTED),
+}
+
+_BALANCE_ERRORS: _ErrorTable = {
+    SessionKeyNotFoundError: ("session_key_not_found", _ERR_BALANCE_NO_SESSION),
+    ZendFiAPIError: ("api_error", _ERR_BALANCE_API),
+    Exception: ("unexpected_error", _ERR_UNEXPECTED),
+}
+
+_AGENT_SESSION_ERRORS: _ErrorTable = {
+    AuthenticationError: ("authentication_failed", _ERR_AUTHENTICATION),
+    ValidationError: ("validation_error", _ERR_VALIDATION),
+    ZendFiAPIError: ("api_error", _ERR_AGENT_SESSION_API),
+    Exception: ("unexpected_error", _ERR_UNEXPECTED),
+}
+
 
 # ============================================
 # Input Schemas (Pydantic v2 for LangChain)
 # ============================================
 
+# Inputs are validated once per call and only read afterwards, so the
+# schemas are frozen (immutable and hashable)
+
 class PaymentInput(BaseModel):
     """Input schema for executing a cryptocurrency payment."""
     
+    model_config = ConfigDict(frozen=True)
+    
     recipient: str = Field(
         description="Solana wallet address of the recipient. "
                     "This is where the payment will be sent."
@@ -59,9 +395,24 @@ class PaymentInput(BaseModel):
     )
 
 
+class BatchPaymentInput(BaseModel):
+    """Input schema for executing several payments at once."""
+    
+    model_config = ConfigDict(frozen=True)
+    
+    payments: List[PaymentInput] = Field(
+        min_length=1,
+        max_length=20,
+        description="Payments to make, each with recipient, amount_usd and description. "
+                    "Up to 20 per call."
+    )
+
+
 class MarketplaceSearchInput(BaseModel):
     """Input schema for searching the agent marketplace."""
     
+    model_config = ConfigDict(frozen=True)
+    
     service_type: str = Field(
         description="Type of service to search for. Common types: "
                     "'gpt4-tokens', 'image-generation', 'code-review', 'data-analysis'."
@@ -75,16 +426,30 @@ class MarketplaceSearchInput(BaseModel):
         default=4.0,
         description="Minimum provider reputation score (0-5). Default is 4.0."
     )
+    top_k: int = Field(
+        default=10,
+        ge=1,
+        le=100,
+        description="Maximum number of providers to return. Default is 10."
+    )
+    sort_by: Literal["price_asc", "price_desc", "reputation_desc"] = Field(
+        default="price_asc",
+        description="Result order: 'price_asc' (cheapest first, default), "
+                    "'price_desc', or 'reputation_desc' (best rated first)."
+    )
 
 
 class BalanceInput(BaseModel):
     """Input schema for checking balance (no inputs required)."""
-    pass
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class CreateSessionInput(BaseModel):
     """Input schema for creating a new session key."""
     
+    model_config = ConfigDict(frozen=True)
+    
     agent_id: str = Field(
         default="langchain-agent",
         description="Unique identifier for this agent. Used for tracking and cross-app compatibility."
@@ -102,6 +467,8 @@ class CreateSessionInput(BaseModel):
 class AgentSessionInput(BaseModel):
     """Input schema for creating an agent session (recommended approach)."""
     
+    model_config = ConfigDict(frozen=True)
+    
     agent_id: str = Field(
         default="langchain-agent",
         description="Unique identifier for this agent."
@@ -120,9 +487,49 @@ class AgentSessionInput(BaseModel):
     )
 
 
+class SessionInput(BaseModel):
+    """Input schema for creating either kind of session."""
+    
+    model_config = ConfigDict(frozen=True)
+    
+    session_type: Literal["agent_session", "session_key"] = Field(
+        default="agent_session",
+        description=(
+            "'agent_session' (recommended; daily and per-transaction limits) "
+            "or 'session_key' (a single total spending limit)."
+        ),
+    )
+    agent_id: str = Field(
+        default="langchain-agent",
+        description="Unique identifier for this agent."
+    )
+    max_per_day: float = Field(
+        default=100.0,
+        description="agent_session only: maximum spending per day in USD."
+    )
+    max_per_transaction: float = Field(
+        default=50.0,
+        description="agent_session only: maximum per-transaction limit in USD."
+    )
+    duration_hours: int = Field(
+        default=24,
+        description="agent_session only: session duration in hours (1-168)."
+    )
+    limit_usd: float = Field(
+        default=10.0,
+        description="session_key only: maximum spending limit in USD."
+    )
+    duration_days: int = Field(
+        default=7,
+        description="session_key only: how many days the key is valid (1-30)."
+    )
+
+
 class PricingInput(BaseModel):
     """Input schema for getting pricing suggestions."""
     
+    model_config = ConfigDict(frozen=True)
+    
     base_price: float = Field(
         description="Original price in USD to get suggestions for."
     )
@@ -132,11 +539,93 @@ class PricingInput(BaseModel):
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _schema_properties(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """JSON schema properties of an input model, built once per model."""
+    return schema.model_json_schema()["properties"]
+
+
 # ============================================
 # Tool Implementations
 # ============================================
 
-class ZendFiPaymentTool(BaseTool):
+class _ZendFiToolBase(BaseTool):
+    """Configuration and client handling shared by the ZendFi tools."""
+    
+    # Configuration
+    api_key: Optional[str] = None
+    mode: str = "test"
+    debug: bool = False
+    # "json" returns compact JSON objects instead of formatted text, for
+    # programmatic pipelines (errors become {"error": ..., "message": ...})
+    output_format: OutputFormat = "pretty"
+    
+    # Shared client (e.g. from create_zendfi_tools); otherwise built lazily
+    client: Optional[ZendFiClient] = Field(default=None, exclude=True)
+    _client: Optional[ZendFiClient] = None
+    
+    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
+    
+    def _client_options(self) -> dict:
+        """Extra ZendFiClient arguments for this tool's own client."""
+        return {"auto_create_session": False}
+    
+    @property
+    def args(self) -> Dict[str, Any]:
+        # Our input models have no injected arguments, so the properties
+        # depend only on the model and are built once per model; each
+        # caller gets its own copy so edits can't leak into other tools
+        if isinstance(self.args_schema, type):
+            return copy.deepcopy(_schema_properties(self.args_schema))
+        return super().args
+    
+    def _get_client(self) -> ZendFiClient:
+        """Get the shared ZendFi client, or create this tool's own."""
+        if self.client is not None:
+            return self.client
+        if self._client is None:
+            self._client = ZendFiClient(
+                api_key=self.api_key,
+                mode=self.mode,
+                debug=self.debug,
+                **self._client_options(),
+            )
+        return self._client
+    
+    def _render(self, data: Dict[str, Any], pretty: Callable[[], str]) -> str:
+        """Return `data` as JSON, or the formatted text built by `pretty`."""
+        if self.output_format == "json":
+            return _json_dumps(data).decode()
+        return pretty()
+    
+    def _render_error(self, error: str, message: Any, pretty: str) -> str:
+        """Return an error as {"error", "message"} JSON, or its formatted text."""
+        if self.output_format == "json":
+            return _json_dumps({"error": error, "message": str(message)}).decode()
+        return pretty
+    
+    def _render_exception(self, e: Exception, errors: _ErrorTable, **fields: Any) -> str:
+        """Render `e` using the first entry of `errors` along its MRO."""
+        for cls in type(e).__mro__:
+            entry = errors.get(cls)
+            if entry is not None:
+                break
+        else:
+            raise e
+        error, template = entry
+        return self._render_error(error, e, template.format(err=e, **fields))
+
+
+class _SpendingToolBase(_ZendFiToolBase):
+    """Base for tools that spend from (and auto-create) a session key."""
+    
+    session_limit_usd: float = 10.0
+    
+    def _client_options(self) -> dict:
+        return {"auto_create_session": True, "session_limit_usd": self.session_limit_usd}
+
+
+class ZendFiPaymentTool(_SpendingToolBase):
     """
     Tool for making autonomous cryptocurrency payments on Solana.
     
@@ -177,28 +666,50 @@ Important: Check your balance first with check_payment_balance if unsure about a
     
     args_schema: Type[BaseModel] = PaymentInput
     
-    # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    session_limit_usd: float = 10.0
-    debug: bool = False
+    # Check the balance alongside the payment and cancel the payment if the
+    # balance comes back first and is too low. Saves the round trip of a
+    # separate check_payment_balance call, but a payment the backend has
+    # already accepted cannot be cancelled, so the limit is still enforced
+    # server-side.
+    preflight_parallel: bool = False
     
-    # Internal client (lazy initialization)
-    _client: Optional[ZendFiClient] = None
-    
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
-    
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=True,
-                session_limit_usd=self.session_limit_usd,
-                debug=self.debug,
-            )
-        return self._client
+    async def _pay(
+        self,
+        client: ZendFiClient,
+        recipient: str,
+        amount_usd: float,
+        description: str,
+    ) -> SmartPaymentResult:
+        """Send the payment, racing it against a balance check if preflight_parallel."""
+        payment = client.smart_payment(
+            agent_id=client._session_agent_id or "langchain-agent",
+            user_wallet=recipient,
+            amount_usd=amount_usd,
+            description=description,
+        )
+        if not self.preflight_parallel:
+            return await payment
+        
+        pay_task = asyncio.ensure_future(payment)
+        status_task = asyncio.ensure_future(client.get_session_status())
+        done, _ = await asyncio.wait(
+            {pay_task, status_task},
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        
+        if pay_task in done:
+            status_task.cancel()
+        elif status_task.exception() is None:
+            # A failed balance check just means no early answer
+            status = status_task.result()
+            if status.remaining_usdc < amount_usd:
+                pay_task.cancel()
+                raise InsufficientBalanceError(
+                    f"Remaining balance ${status.remaining_usdc:.2f} "
+                    f"is below ${amount_usd:.2f}"
+                )
+        
+        return await pay_task
     
     def _run(
         self,
@@ -220,9 +731,7 @@ Important: Check your balance first with check_payment_balance if unsure about a
             Human-readable payment confirmation
         """
         # Run async method in sync context
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(recipient, amount_usd, description, run_manager=None)
-        )
+        return _run_sync(self._arun, recipient, amount_usd, description)
     
     async def _arun(
         self,
@@ -247,79 +756,210 @@ Important: Check your balance first with check_payment_balance if unsure about a
             client = self._get_client()
             
             # Use smart_payment API for production
-            result = await client.smart_payment(
-                agent_id=self._client._session_agent_id or "langchain-agent",
-                user_wallet=recipient,
-                amount_usd=amount_usd,
-                description=description,
-            )
-            
-            # Format transaction signature if available
-            sig_display = result.transaction_signature[:20] + "..." if result.transaction_signature else "pending"
-            
-            output = f"""✅ Payment Successful!
-
-Amount: ${amount_usd:.2f} USD
-Recipient: {recipient}
-Transaction: {sig_display}
-Description: {description}
-Payment ID: {result.payment_id}
-Status: {result.status}"""
-
-            if result.gasless_used:
-                output += "\nGasless: Yes (ZendFi paid the network fees)"
+            result = await self._pay(client, recipient, amount_usd, description)
             
-            if result.receipt_url:
-                output += f"\nReceipt: {result.receipt_url}"
+            # The balance changed; don't let the balance tool serve a stale one
+            _apply_payment_to_status(client, result)
             
-            if result.confirmed_in_ms:
-                output += f"\nConfirmed in: {result.confirmed_in_ms}ms"
-            
-            return output
-
-        except InsufficientBalanceError as e:
-            return f"""Payment Failed: Insufficient Balance
-
-You tried to pay ${amount_usd:.2f} but don't have enough funds.
-
-Tip: Use the check_payment_balance tool to see your remaining balance,
-   or create a new session key with a higher limit."""
-
-        except SessionKeyExpiredError as e:
-            return f"""Payment Failed: Session Key Expired
-
-Your session key has expired and can no longer be used for payments.
-
-Tip: Create a new session key to continue making payments."""
+            return self._render(
+                {
+                    "payment_id": result.payment_id,
+                    "status": result.status,
+                    "amount_usd": amount_usd,
+                    "recipient": recipient,
+                    "description": description,
+                    "transaction_signature": result.transaction_signature,
+                    "gasless_used": result.gasless_used,
+                    "receipt_url": result.receipt_url,
+                    "confirmed_in_ms": result.confirmed_in_ms,
+                },
+                lambda: self._format_payment(result, recipient, amount_usd, description),
+            )
 
-        except SessionKeyNotFoundError as e:
-            return f"""Payment Failed: No Session Key
+        except Exception as e:
+            return self._render_exception(e, _PAYMENT_ERRORS, amount_usd=amount_usd)
+    
+    @staticmethod
+    def _format_payment(
+        result: SmartPaymentResult,
+        recipient: str,
+        amount_usd: float,
+        description: str,
+    ) -> str:
+        """Format a payment confirmation for the agent."""
+        signature = result.transaction_signature
+        if signature:
+            sig_display = f"{signature[:20]}..."
+        else:
+            sig_display = "pending"
+        
+        parts = [_PAYMENT_SUCCESS_TMPL.format(
+            amount_usd=amount_usd,
+            recipient=recipient,
+            sig_display=sig_display,
+            description=description,
+            result=result,
+        )]
+
+        if result.gasless_used:
+            parts.append("Gasless: Yes (ZendFi paid the network fees)")
+        
+        if result.receipt_url:
+            parts.append(f"Receipt: {result.receipt_url}")
+        
+        if result.confirmed_in_ms:
+            parts.append(f"Confirmed in: {result.confirmed_in_ms}ms")
+        
+        return "\n".join(parts)
 
-No session key is configured for this agent.
 
-Tip: A session key will be created automatically on the next attempt,
-   or you can create one explicitly with specific limits."""
+class ZendFiBatchPaymentTool(_SpendingToolBase):
+    """
+    Tool for making several cryptocurrency payments in one call.
+    
+    Useful when an agent has picked several providers (e.g. from the
+    marketplace) and would otherwise call make_crypto_payment once per
+    provider. The payments are sent concurrently over one connection
+    pool, and the session balance is refreshed once afterwards so a
+    following check_payment_balance call is answered from cache.
+    
+    Example:
+        >>> tool = ZendFiBatchPaymentTool(session_limit_usd=10.0)
+        >>> result = tool.invoke({"payments": [
+        ...     {"recipient": "ProviderWallet1", "amount_usd": 0.50, "description": "Tokens"},
+        ...     {"recipient": "ProviderWallet2", "amount_usd": 1.00, "description": "Images"},
+        ... ]})
+    """
+    
+    name: str = "make_crypto_payments_batch"
+    description: str = """Execute several cryptocurrency payments on Solana using USDC in one call.
 
-        except ZendFiAPIError as e:
-            return f"""Payment Failed: {str(e)}
+Use this instead of repeated make_crypto_payment calls when paying more than
+one recipient. Each payment succeeds or fails on its own.
 
-Please verify:
-- The recipient address is a valid Solana wallet
-- You have sufficient balance in your session key
-- Your session key hasn't expired"""
+Arguments:
+- payments: list of payments, each with:
+  - recipient: Solana wallet address to send payment to
+  - amount_usd: Amount in USD (e.g., 1.50 for $1.50)
+  - description: What you're paying for
 
+Returns one line per payment and the remaining balance."""
+    
+    args_schema: Type[BaseModel] = BatchPaymentInput
+    
+    # Most payments in flight at once, to stay under API rate limits
+    max_concurrency: int = 8
+    
+    def _run(
+        self,
+        payments: List[Any],
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        """Execute the payments synchronously."""
+        return _run_sync(self._arun, payments)
+    
+    async def _arun(
+        self,
+        payments: List[Any],
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> str:
+        """Execute the payments asynchronously."""
+        try:
+            client = self._get_client()
+            payments = [PaymentInput.model_validate(payment) for payment in payments]
+            agent_id = client._session_agent_id or "langchain-agent"
+            
+            results = await client.smart_payment_many(
+                [
+                    {
+                        "agent_id": agent_id,
+                        "user_wallet": payment.recipient,
+                        "amount_usd": payment.amount_usd,
+                        "description": payment.description,
+                    }
+                    for payment in payments
+                ],
+                return_exceptions=True,
+                max_concurrency=self.max_concurrency,
+            )
+            
+            # Refresh the balance once for the whole batch, so a following
+            # balance check is served from the status cache
+            _status_cache.pop(client, None)
+            try:
+                status = await client.get_session_status()
+            except Exception:
+                status = None
+            else:
+                _status_cache[client] = (time.monotonic() + _STATUS_TTL_S, status)
+        
         except Exception as e:
-            return f"""Unexpected Error: {str(e)}
-
-Please try again or contact support if the issue persists."""
+            return self._render_error("unexpected_error", e, _ERR_PAYMENT_UNEXPECTED.format(err=e))
+        
+        return self._render(
+            {
+                "payments": [
+                    {
+                        "recipient": payment.recipient,
+                        "amount_usd": payment.amount_usd,
+                        "description": payment.description,
+                        **(
+                            {"error": str(result)}
+                            if isinstance(result, BaseException)
+                            else {"payment_id": result.payment_id, "status": result.status}
+                        ),
+                    }
+                    for payment, result in zip(payments, results)
+                ],
+                "remaining_usdc": None if status is None else status.remaining_usdc,
+            },
+            lambda: self._format_batch(payments, results, status),
+        )
+    
+    @staticmethod
+    def _format_batch(
+        payments: List[PaymentInput],
+        results: List[Any],
+        status: Optional[SessionKeyStatus],
+    ) -> str:
+        """Format one line per payment, plus totals, for the agent."""
+        lines = []
+        paid_usd = 0.0
+        succeeded = 0
+        for n, (payment, result) in enumerate(zip(payments, results), 1):
+            if isinstance(result, BaseException):
+                lines.append(_BATCH_PAYMENT_LINE_FAILED.format(
+                    n=n,
+                    amount_usd=payment.amount_usd,
+                    recipient=payment.recipient,
+                    description=payment.description,
+                    err=result,
+                ))
+            else:
+                succeeded += 1
+                paid_usd += payment.amount_usd
+                lines.append(_BATCH_PAYMENT_LINE_OK.format(
+                    n=n,
+                    amount_usd=payment.amount_usd,
+                    recipient=payment.recipient,
+                    description=payment.description,
+                    result=result,
+                ))
+        
+        header = "✅ Batch Payment Complete" if succeeded == len(payments) else "⚠️ Batch Payment Partially Failed"
+        lines.insert(0, f"{header}: {succeeded} of {len(payments)} succeeded\n")
+        lines.append(f"\nTotal paid: ${paid_usd:.2f} USD")
+        if status is not None:
+            lines.append(f"Remaining balance: ${status.remaining_usdc:.2f} / ${status.limit_usdc:.2f} USD")
+        return "\n".join(lines)
 
 
-class ZendFiMarketplaceTool(BaseTool):
+class ZendFiMarketplaceTool(_ZendFiToolBase):
     """
     Tool for searching the ZendFi agent marketplace.
     
     Enables agents to discover and compare service providers
-    before making payments. Returns providers sorted by price
+    before making payments. Returns the top providers sorted by price
     with reputation scores and wallet addresses.
     
     Example:
@@ -343,206 +983,404 @@ Arguments:
 - service_type: What you need ('gpt4-tokens', 'image-generation', 'code-review', etc.)
 - max_price: Optional price limit per unit
 - min_reputation: Minimum reputation score (default: 4.0)
+- top_k: Maximum number of providers to return (default: 10)
+- sort_by: 'price_asc' (default), 'price_desc', or 'reputation_desc'
 
 After finding a provider, use make_crypto_payment with their wallet address."""
     
     args_schema: Type[BaseModel] = MarketplaceSearchInput
     
     # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    debug: bool = False
-    
-    _client: Optional[ZendFiClient] = None
+    cache_ttl_seconds: float = 30.0  # 0 disables result caching
+    cache_maxsize: int = 100
     
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
-    
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=False,  # Marketplace search doesn't need session
-                debug=self.debug,
-            )
-        return self._client
+    # (service_type, max_price, min_reputation, top_k, sort_by, output_format)
+    #   -> (expires_at, formatted result)
+    _search_cache: "OrderedDict[tuple, Tuple[float, str]]" = PrivateAttr(default_factory=OrderedDict)
+    # Searches in flight, so concurrent identical searches share one request
+    _search_inflight: "dict[tuple, asyncio.Future]" = PrivateAttr(default_factory=dict)
     
     def _run(
         self,
         service_type: str,
         max_price: Optional[float] = None,
         min_reputation: float = 4.0,
+        top_k: int = 10,
+        sort_by: str = "price_asc",
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         """Search for providers synchronously."""
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(service_type, max_price, min_reputation, run_manager=None)
-        )
+        return _run_sync(self._arun, service_type, max_price, min_reputation, top_k, sort_by)
     
     async def _arun(
         self,
         service_type: str,
         max_price: Optional[float] = None,
         min_reputation: float = 4.0,
+        top_k: int = 10,
+        sort_by: str = "price_asc",
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Search for providers asynchronously."""
-        try:
-            client = self._get_client()
-            providers = await client.search_marketplace(
-                service_type=service_type,
-                max_price=max_price,
-                min_reputation=min_reputation,
+        # Agents often repeat the same search while planning; serve those
+        # from the cache of formatted results. Filters are keyed exactly:
+        # a result fetched for max_price=0.104 may hold providers above 0.1.
+        cache_key = (
+            service_type,
+            max_price,
+            min_reputation,
+            top_k,
+            sort_by,
+            self.output_format,
+        )
+        cached = self._search_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[0]:
+            self._search_cache.move_to_end(cache_key)
+            return cached[1]
+        
+        # Join an identical search that's already running on this loop
+        # rather than sending a second request
+        search = self._search_inflight.get(cache_key)
+        if search is None or search.get_loop() is not asyncio.get_running_loop():
+            search = asyncio.ensure_future(
+                self._search(service_type, max_price, min_reputation, top_k, sort_by)
             )
+            self._search_inflight[cache_key] = search
+            
+            def _forget(done: asyncio.Future) -> None:
+                if self._search_inflight.get(cache_key) is done:
+                    del self._search_inflight[cache_key]
             
-            if not providers:
-                filters = [f"service type '{service_type}'"]
-                if max_price:
-                    filters.append(f"max price ${max_price:.2f}")
-                if min_reputation > 0:
-                    filters.append(f"min reputation {min_reputation}")
-                    
-                return f"""No providers found matching your criteria:
+            search.add_done_callback(_forget)
+        
+        try:
+            result = await asyncio.shield(search)
+        except ZendFiAPIError as e:
+            return self._render_error("api_error", e, _ERR_MARKETPLACE_API.format(err=e))
+        except Exception as e:
+            return self._render_error("unexpected_error", e, _ERR_UNEXPECTED.format(err=e))
+        
+        if self.cache_ttl_seconds > 0:
+            self._search_cache[cache_key] = (time.monotonic() + self.cache_ttl_seconds, result)
+            self._search_cache.move_to_end(cache_key)
+            while len(self._search_cache) > self.cache_maxsize:
+                self._search_cache.popitem(last=False)
+        return result
+    
+    async def _search(
+        self,
+        service_type: str,
+        max_price: Optional[float],
+        min_reputation: float,
+        top_k: int,
+        sort_by: str,
+    ) -> str:
+        """Query the marketplace and format the top providers found."""
+        client = self._get_client()
+        providers = await client.search_marketplace(
+            service_type=service_type,
+            max_price=max_price,
+            min_reputation=min_reputation,
+            sort_by=sort_by,
+            limit=top_k,
+        )
+        
+        if self.output_format == "json":
+            return _json_dumps({"providers": [
+                {
+                    "agent_id": provider.agent_id,
+                    "agent_name": provider.agent_name,
+                    "price_per_unit": provider.price_per_unit,
+                    "reputation": provider.reputation,
+                    "wallet": provider.wallet,
+                    "description": provider.description,
+                }
+                for provider in providers
+            ]}).decode()
+        
+        if not providers:
+            filters = [f"service type '{service_type}'"]
+            if max_price:
+                filters.append(f"max price ${max_price:.2f}")
+            if min_reputation > 0:
+                filters.append(f"min reputation {min_reputation}")
+                
+            return f"""No providers found matching your criteria:
 {', '.join(filters)}
 
 Try:
 - Broadening your search (higher max_price or lower min_reputation)
 - Checking for alternative service types"""
-            
-            result = f"""Found {len(providers)} provider(s) for '{service_type}'
+        
+        parts = [f"""Found {len(providers)} provider(s) for '{service_type}'
 
-"""
-            for i, provider in enumerate(providers, 1):
-                stars = "⭐" * int(provider.reputation) + "☆" * (5 - int(provider.reputation))
-                result += f"""**{i}. {provider.agent_name}**
+"""]
+        for i, provider in enumerate(providers, 1):
+            stars = _STAR_BARS[min(5, max(0, int(provider.reputation)))]
+            parts.append(f"""**{i}. {provider.agent_name}**
    Price: ${provider.price_per_unit:.3f} per unit
    {stars} ({provider.reputation:.1f}/5.0)
    Description: {provider.description or 'No description'}
    Agent ID: {provider.agent_id}
    Wallet: {provider.wallet}
-"""
+""")
+        
+        parts.append("""---
+To purchase from a provider, use make_crypto_payment with:
+- Their wallet address as 'recipient'
+- The total amount (price × quantity) as 'amount_usd'""")
+        
+        return "".join(parts)
+
+
+class ZendFiBalanceTool(_SpendingToolBase):
+    """
+    Tool for checking session key balance and spending limits.
+    
+    Returns current balance, amount spent, total limit, and
+    expiration information for the agent's session key.
+    
+    Example:
+        >>> tool = ZendFiBalanceTool()
+        >>> result = tool.invoke({})
+    """
+    
+    name: str = "check_payment_balance"
+    description: str = """Check your current payment balance and session key status.
+
+Returns:
+- Remaining balance in USD
+- Amount already spent
+- Total spending limit
+- Session expiration date
+- Whether the session is active
+
+Use this before making payments to ensure sufficient funds."""
+    
+    args_schema: Type[BaseModel] = BalanceInput
+    
+    def _run(
+        self,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+    ) -> str:
+        """Check balance synchronously."""
+        return _run_sync(self._arun)
+    
+    async def _arun(
+        self,
+        run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
+    ) -> str:
+        """Check balance asynchronously."""
+        try:
+            client = self._get_client()
+            # Agents tend to check the balance several times while planning;
+            # reuse a status fetched moments ago by this client
+            cached = _status_cache.get(client)
+            if cached is not None and time.monotonic() < cached[0]:
+                status = cached[1]
+            else:
+                status = await client.get_session_status()
+                _status_cache[client] = (time.monotonic() + _STATUS_TTL_S, status)
+            
+            return self._render(
+                {
+                    "session_key_id": status.session_key_id,
+                    "is_active": status.is_active,
+                    "remaining_usdc": status.remaining_usdc,
+                    "used_amount_usdc": status.used_amount_usdc,
+                    "limit_usdc": status.limit_usdc,
+                    "expires_at": status.expires_at,
+                    "days_until_expiry": status.days_until_expiry,
+                },
+                lambda: self._format_balance(status),
+            )
+
+        except Exception as e:
+            return self._render_exception(e, _BALANCE_ERRORS)
+    
+    @staticmethod
+    def _format_balance(status: SessionKeyStatus) -> str:
+        """Format a session status, with a progress bar, for the agent."""
+        pct_remaining = (status.remaining_usdc * 100 / status.limit_usdc) if status.limit_usdc > 0 else 0
+        progress_bar = _BARS[min(10, max(0, int(pct_remaining) // 10))]
+        status_emoji, status_text = _STATUS_LABELS[bool(status.is_active)]
+        
+        return _BALANCE_TMPL.format(
+            status=status,
+            status_emoji=status_emoji,
+            status_text=status_text,
+            progress_bar=progress_bar,
+            pct_remaining=pct_remaining,
+        )
+
+
+class _SessionToolBase(_ZendFiToolBase):
+    """Base for the tools that create session keys and agent sessions."""
+    
+    async def _create_session_key(
+        self,
+        user_wallet: str,
+        agent_id: str,
+        limit_usd: float,
+        duration_days: int,
+    ) -> str:
+        try:
+            client = self._get_client()
+            
+            result = await client.create_session_key(
+                user_wallet=user_wallet,
+                agent_id=agent_id,
+                limit_usdc=limit_usd,
+                duration_days=duration_days,
+            )
+            
+            return self._render(
+                {
+                    "session_key_id": result.session_key_id,
+                    "session_wallet": result.session_wallet,
+                    "limit_usdc": result.limit_usdc,
+                    "expires_at": result.expires_at,
+                    "agent_id": result.agent_id,
+                },
+                lambda: _SESSION_KEY_CREATED_TMPL.format(result=result),
+            )
+
+        except ZendFiAPIError as e:
+            return self._render_error("api_error", e, _ERR_CREATE_SESSION_API.format(err=e))
+        
+        except Exception as e:
+            return self._render_error("unexpected_error", e, _ERR_UNEXPECTED_PLAIN.format(err=e))
+    
+    async def _create_agent_session(
+        self,
+        user_wallet: Optional[str],
+        agent_id: str,
+        max_per_day: float,
+        max_per_transaction: float,
+        duration_hours: int,
+    ) -> str:
+        try:
+            client = self._get_client()
             
-            result += """---
-To purchase from a provider, use make_crypto_payment with:
-- Their wallet address as 'recipient'
-- The total amount (price × quantity) as 'amount_usd'"""
+            if not user_wallet:
+                return self._render_error(
+                    "user_wallet_not_configured",
+                    "Set ZENDFI_USER_WALLET or the tool's user_wallet",
+                    _ERR_NO_USER_WALLET,
+                )
+            
+            limits = _make_limits(max_per_transaction, max_per_day)
+            
+            result = await client.create_agent_session(
+                agent_id=agent_id,
+                user_wallet=user_wallet,
+                limits=limits,
+                duration_hours=duration_hours,
+            )
             
-            return result
+            # The session token is a credential; it stays out of both formats
+            return self._render(
+                {
+                    "session_id": result.id,
+                    "agent_id": result.agent_id,
+                    "agent_name": result.agent_name,
+                    "user_wallet": result.user_wallet,
+                    "max_per_transaction": limits.max_per_transaction,
+                    "max_per_day": limits.max_per_day,
+                    "max_per_week": limits.max_per_week,
+                    "expires_at": result.expires_at,
+                },
+                lambda: _AGENT_SESSION_CREATED_TMPL.format(
+                    result=result,
+                    limits=limits,
+                    agent=result.agent_name or result.agent_id,
+                ),
+            )
 
-        except ZendFiAPIError as e:
-            return f"❌ Marketplace search failed: {str(e)}"
-        
         except Exception as e:
-            return f"❌ Unexpected error: {str(e)}"
+            return self._render_exception(e, _AGENT_SESSION_ERRORS)
 
 
-class ZendFiBalanceTool(BaseTool):
+class ZendFiSessionTool(_SessionToolBase):
     """
-    Tool for checking session key balance and spending limits.
+    Tool for creating an agent session or a session key.
     
-    Returns current balance, amount spent, total limit, and
-    expiration information for the agent's session key.
+    Combines ZendFiAgentSessionTool and ZendFiCreateSessionTool behind a
+    single session_type argument, so an agent carries one session tool
+    description instead of two.
     
     Example:
-        >>> tool = ZendFiBalanceTool()
-        >>> result = tool.invoke({})
+        >>> tool = ZendFiSessionTool()
+        >>> result = tool.invoke({
+        ...     "session_type": "agent_session",
+        ...     "agent_id": "shopping-agent",
+        ...     "max_per_day": 50.0,
+        ... })
     """
     
-    name: str = "check_payment_balance"
-    description: str = """Check your current payment balance and session key status.
+    name: str = "create_session"
+    description: str = """Create a session for autonomous payments.
 
-Returns:
-- Remaining balance in USD
-- Amount already spent
-- Total spending limit
-- Session expiration date
-- Whether the session is active
+Arguments:
+- session_type: 'agent_session' (recommended) or 'session_key'
+- agent_id: Unique identifier for this agent
+- For agent_session: max_per_day (default: 100), max_per_transaction
+  (default: 50) and duration_hours (default: 24)
+- For session_key: limit_usd (default: 10.0) and duration_days, 1-30
+  (default: 7)
 
-Use this before making payments to ensure sufficient funds."""
+Returns the session details and limits."""
     
-    args_schema: Type[BaseModel] = BalanceInput
+    args_schema: Type[BaseModel] = SessionInput
     
     # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    session_limit_usd: float = 10.0
-    debug: bool = False
-    
-    _client: Optional[ZendFiClient] = None
-    
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
+    # Falls back to ZENDFI_USER_WALLET (read once, at construction)
+    user_wallet: Optional[str] = Field(default=None, validate_default=True)
     
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=True,
-                session_limit_usd=self.session_limit_usd,
-                debug=self.debug,
-            )
-        return self._client
+    @field_validator("user_wallet")
+    @classmethod
+    def _env_user_wallet(cls, value: Optional[str]) -> Optional[str]:
+        return value or os.getenv("ZENDFI_USER_WALLET")
     
     def _run(
         self,
+        session_type: str = "agent_session",
+        agent_id: str = "langchain-agent",
+        max_per_day: float = 100.0,
+        max_per_transaction: float = 50.0,
+        duration_hours: int = 24,
+        limit_usd: float = 10.0,
+        duration_days: int = 7,
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
-        """Check balance synchronously."""
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(run_manager=None)
+        """Create a session synchronously."""
+        return _run_sync(
+            self._arun, session_type, agent_id, max_per_day, max_per_transaction,
+            duration_hours, limit_usd, duration_days,
         )
     
     async def _arun(
         self,
+        session_type: str = "agent_session",
+        agent_id: str = "langchain-agent",
+        max_per_day: float = 100.0,
+        max_per_transaction: float = 50.0,
+        duration_hours: int = 24,
+        limit_usd: float = 10.0,
+        duration_days: int = 7,
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
-        """Check balance asynchronously."""
-        try:
-            client = self._get_client()
-            status = await client.get_session_status()
-            
-            # Calculate percentage remaining
-            pct_remaining = (status.remaining_usdc / status.limit_usdc * 100) if status.limit_usdc > 0 else 0
-            
-            # Status indicator
-            status_emoji = "🟢" if status.is_active else "🔴"
-            status_text = "Active" if status.is_active else "Inactive"
-            
-            # Progress bar
-            bar_filled = int(pct_remaining / 10)
-            bar_empty = 10 - bar_filled
-            progress_bar = "█" * bar_filled + "░" * bar_empty
-            
-            return f"""Session Key Balance
-
-{status_emoji} Status: {status_text}
-Balance: ${status.remaining_usdc:.2f} / ${status.limit_usdc:.2f} USD
-   [{progress_bar}] {pct_remaining:.0f}% remaining
-
-Spent: ${status.used_amount_usdc:.2f} USD
-Expires: {status.expires_at}
-   ({status.days_until_expiry} days remaining)
-
-Session ID: {status.session_key_id}"""
-
-        except SessionKeyNotFoundError:
-            return """⚠️ No Session Key Found
-
-A session key hasn't been created yet. One will be created
-automatically when you make your first payment.
-
-Or use create_session_key to create one with custom limits."""
-
-        except ZendFiAPIError as e:
-            return f"❌ Failed to check balance: {str(e)}"
-        
-        except Exception as e:
-            return f"❌ Unexpected error: {str(e)}"
+        """Create a session asynchronously."""
+        if session_type == "session_key":
+            return await self._create_session_key(
+                self.user_wallet or "demo-wallet", agent_id, limit_usd, duration_days,
+            )
+        return await self._create_agent_session(
+            self.user_wallet, agent_id, max_per_day, max_per_transaction, duration_hours,
+        )
 
 
-class ZendFiCreateSessionTool(BaseTool):
+class ZendFiCreateSessionTool(_SessionToolBase):
     """
     Tool for creating a new session key with custom limits.
     
@@ -574,25 +1412,13 @@ Returns the session key details including wallet address and limits."""
     args_schema: Type[BaseModel] = CreateSessionInput
     
     # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    user_wallet: Optional[str] = None
-    debug: bool = False
-    
-    _client: Optional[ZendFiClient] = None
-    
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
+    # Falls back to ZENDFI_USER_WALLET (read once, at construction)
+    user_wallet: Optional[str] = Field(default=None, validate_default=True)
     
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=False,
-                debug=self.debug,
-            )
-        return self._client
+    @field_validator("user_wallet")
+    @classmethod
+    def _default_user_wallet(cls, value: Optional[str]) -> str:
+        return value or os.getenv("ZENDFI_USER_WALLET", "demo-wallet")
     
     def _run(
         self,
@@ -602,9 +1428,7 @@ Returns the session key details including wallet address and limits."""
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         """Create session key synchronously."""
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(agent_id, limit_usd, duration_days, run_manager=None)
-        )
+        return _run_sync(self._arun, agent_id, limit_usd, duration_days)
     
     async def _arun(
         self,
@@ -614,37 +1438,10 @@ Returns the session key details including wallet address and limits."""
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Create session key asynchronously."""
-        try:
-            import os
-            client = self._get_client()
-            user_wallet = self.user_wallet or os.getenv("ZENDFI_USER_WALLET", "demo-wallet")
-            
-            result = await client.create_session_key(
-                user_wallet=user_wallet,
-                agent_id=agent_id,
-                limit_usdc=limit_usd,
-                duration_days=duration_days,
-            )
-            
-            return f"""✅ Session Key Created Successfully!
-
-Session ID: {result.session_key_id}
-Session Wallet: {result.session_wallet}
-Spending Limit: ${result.limit_usdc:.2f} USD
-Expires: {result.expires_at}
-Agent ID: {result.agent_id}
-
-You can now make autonomous payments up to your spending limit.
-Use check_payment_balance to monitor your remaining balance."""
-
-        except ZendFiAPIError as e:
-            return f"Failed to create session key: {str(e)}"
-        
-        except Exception as e:
-            return f"Unexpected error: {str(e)}"
+        return await self._create_session_key(self.user_wallet, agent_id, limit_usd, duration_days)
 
 
-class ZendFiAgentSessionTool(BaseTool):
+class ZendFiAgentSessionTool(_SessionToolBase):
     """
     Tool for creating agent sessions with spending limits (recommended).
     
@@ -682,25 +1479,13 @@ Returns session details including session token."""
     args_schema: Type[BaseModel] = AgentSessionInput
     
     # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    user_wallet: Optional[str] = None
-    debug: bool = False
-    
-    _client: Optional[ZendFiClient] = None
-    
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
+    # Falls back to ZENDFI_USER_WALLET (read once, at construction)
+    user_wallet: Optional[str] = Field(default=None, validate_default=True)
     
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=False,
-                debug=self.debug,
-            )
-        return self._client
+    @field_validator("user_wallet")
+    @classmethod
+    def _env_user_wallet(cls, value: Optional[str]) -> Optional[str]:
+        return value or os.getenv("ZENDFI_USER_WALLET")
     
     def _run(
         self,
@@ -711,9 +1496,7 @@ Returns session details including session token."""
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         """Create agent session synchronously."""
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(agent_id, max_per_day, max_per_transaction, duration_hours, run_manager=None)
-        )
+        return _run_sync(self._arun, agent_id, max_per_day, max_per_transaction, duration_hours)
     
     async def _arun(
         self,
@@ -724,64 +1507,12 @@ Returns session details including session token."""
         run_manager: Optional[AsyncCallbackManagerForToolRun] = None,
     ) -> str:
         """Create agent session asynchronously."""
-        try:
-            client = self._get_client()
-            user_wallet = self.user_wallet or os.getenv("ZENDFI_USER_WALLET")
-            
-            if not user_wallet:
-                return """❌ User wallet not configured.
-
-Please set ZENDFI_USER_WALLET environment variable or configure
-the user_wallet parameter on the tool."""
-            
-            limits = SessionLimits(
-                max_per_transaction=max_per_transaction,
-                max_per_day=max_per_day,
-                max_per_week=max_per_day * 7,
-                max_per_month=max_per_day * 30,
-            )
-            
-            result = await client.create_agent_session(
-                agent_id=agent_id,
-                user_wallet=user_wallet,
-                limits=limits,
-                duration_hours=duration_hours,
-            )
-            
-            return f"""Agent Session Created Successfully!
-
-Session ID: {result.id}
-Agent: {result.agent_name or result.agent_id}
-Wallet: {result.user_wallet}
-Spending Limits:
-   • Per Transaction: ${limits.max_per_transaction:.2f}
-   • Per Day: ${limits.max_per_day:.2f}
-   • Per Week: ${limits.max_per_week:.2f}
-
-Expires: {result.expires_at}
-
-You can now make autonomous payments within your limits.
-Use check_payment_balance to monitor spending."""
-
-        except AuthenticationError:
-            return """❌ Authentication Failed
-
-Your ZendFi API key is invalid or missing.
-Please check your ZENDFI_API_KEY environment variable."""
-
-        except ValidationError as e:
-            return f"""❌ Validation Error: {str(e)}
-
-Please check your input parameters."""
-
-        except ZendFiAPIError as e:
-            return f"❌ Failed to create session: {str(e)}"
-        
-        except Exception as e:
-            return f"❌ Unexpected error: {str(e)}"
+        return await self._create_agent_session(
+            self.user_wallet, agent_id, max_per_day, max_per_transaction, duration_hours,
+        )
 
 
-class ZendFiPricingTool(BaseTool):
+class ZendFiPricingTool(_ZendFiToolBase):
     """
     Tool for getting PPP-adjusted pricing suggestions.
     
@@ -812,26 +1543,6 @@ Returns:
     
     args_schema: Type[BaseModel] = PricingInput
     
-    # Configuration
-    api_key: Optional[str] = None
-    mode: str = "test"
-    debug: bool = False
-    
-    _client: Optional[ZendFiClient] = None
-    
-    model_config: ClassVar[dict] = {"arbitrary_types_allowed": True}
-    
-    def _get_client(self) -> ZendFiClient:
-        """Get or create ZendFi client."""
-        if self._client is None:
-            self._client = ZendFiClient(
-                api_key=self.api_key,
-                mode=self.mode,
-                auto_create_session=False,
-                debug=self.debug,
-            )
-        return self._client
-    
     def _run(
         self,
         base_price: float,
@@ -839,9 +1550,7 @@ Returns:
         run_manager: Optional[CallbackManagerForToolRun] = None,
     ) -> str:
         """Get pricing suggestion synchronously."""
-        return asyncio.get_event_loop().run_until_complete(
-            self._arun(base_price, country_code, run_manager=None)
-        )
+        return _run_sync(self._arun, base_price, country_code)
     
     async def _arun(
         self,
@@ -853,30 +1562,73 @@ Returns:
         try:
             client = self._get_client()
             
-            # If country code provided, first get PPP factor
-            ppp_info = ""
-            if country_code:
+            # The PPP factor is display-only (the suggestion endpoint applies
+            # PPP itself), so fetch it alongside the suggestion
+            ppp_task = (
+                asyncio.ensure_future(_get_ppp_factor_cached(client, country_code))
+                if country_code else None
+            )
+            try:
+                suggestion = await client.get_pricing_suggestion(
+                    agent_id="langchain-pricing",
+                    base_price=base_price,
+                    location_country=country_code,
+                )
+            except BaseException:
+                if ppp_task is not None:
+                    ppp_task.cancel()
+                raise
+            
+            ppp: Optional[PPPFactor] = None
+            if ppp_task is not None:
                 try:
-                    ppp = await client.get_ppp_factor(country_code)
-                    ppp_info = f"""
+                    ppp = await ppp_task
+                except ZendFiAPIError:
+                    pass  # Reported as "could not fetch" below
+            
+            discount = ((base_price - suggestion.suggested_amount) / base_price) * 100 if base_price > 0 else 0
+            
+            return self._render(
+                {
+                    "base_price": base_price,
+                    "suggested_amount": suggestion.suggested_amount,
+                    "min_amount": suggestion.min_amount,
+                    "max_amount": suggestion.max_amount,
+                    "discount_percent": discount,
+                    "reasoning": suggestion.reasoning,
+                    "country_code": country_code,
+                    "ppp_factor": None if ppp is None else ppp.ppp_factor,
+                },
+                lambda: self._format_suggestion(base_price, country_code, suggestion, ppp, discount),
+            )
+
+        except ZendFiAPIError as e:
+            return self._render_error("api_error", e, _ERR_PRICING_API.format(err=e))
+        
+        except Exception as e:
+            return self._render_error("unexpected_error", e, _ERR_UNEXPECTED_PLAIN.format(err=e))
+    
+    @staticmethod
+    def _format_suggestion(
+        base_price: float,
+        country_code: Optional[str],
+        suggestion: PricingSuggestion,
+        ppp: Optional[PPPFactor],
+        discount: float,
+    ) -> str:
+        """Format a pricing suggestion, with PPP details if fetched, for the agent."""
+        ppp_info = ""
+        if ppp is not None:
+            ppp_info = f"""
 PPP Factor for {ppp.country_name}:
    Factor: {ppp.ppp_factor:.2f}
    Adjustment: {ppp.adjustment_percentage:+.0f}%
    Local Currency: {ppp.currency_code}
 """
-                except ZendFiAPIError:
-                    ppp_info = f"\nCould not fetch PPP data for {country_code}\n"
-            
-            # Get AI pricing suggestion
-            suggestion = await client.get_pricing_suggestion(
-                agent_id="langchain-pricing",
-                base_price=base_price,
-                location_country=country_code,
-            )
-            
-            discount = ((base_price - suggestion.suggested_amount) / base_price) * 100 if base_price > 0 else 0
-            
-            return f"""Pricing Suggestion
+        elif country_code:
+            ppp_info = f"\nCould not fetch PPP data for {country_code}\n"
+        
+        return f"""Pricing Suggestion
 
 Base Price: ${base_price:.2f} USD
 Suggested Price: ${suggestion.suggested_amount:.2f} USD
@@ -888,26 +1640,105 @@ Price Range:
    Min: ${suggestion.min_amount:.2f}
    Max: ${suggestion.max_amount:.2f}"""
 
-        except ZendFiAPIError as e:
-            return f"Pricing suggestion failed: {str(e)}"
-        
-        except Exception as e:
-            return f"Unexpected error: {str(e)}"
-
 
 # ============================================
-# Convenience function for creating all tools
+# Toolkit and convenience functions
 # ============================================
 
+class ZendFiToolkit(BaseToolkit):
+    """
+    ZendFi tools sharing one configured ZendFiClient, built on first access.
+    
+    Each tool is a cached property, so an agent that only binds the payment
+    tool never constructs the others (or the client, until a tool needs it).
+    
+    Example:
+        >>> toolkit = ZendFiToolkit(session_limit_usd=25.0)
+        >>> agent = create_agent(llm, [toolkit.payment, toolkit.balance])
+        >>> # or every default tool:
+        >>> agent = create_agent(llm, toolkit.get_tools())
+    """
+    
+    api_key: Optional[str] = None
+    mode: str = "test"
+    session_limit_usd: float = 10.0
+    user_wallet: Optional[str] = None
+    debug: bool = False
+    output_format: OutputFormat = "pretty"
+    
+    @functools.cached_property
+    def client(self) -> ZendFiClient:
+        # One client for all tools: a single connection pool, and session
+        # state created by one tool is visible to the others
+        return ZendFiClient(
+            api_key=self.api_key,
+            mode=self.mode,
+            auto_create_session=True,
+            session_limit_usd=self.session_limit_usd,
+            debug=self.debug,
+        )
+    
+    def _common_config(self) -> Dict[str, Any]:
+        return {
+            "api_key": self.api_key,
+            "mode": self.mode,
+            "debug": self.debug,
+            "output_format": self.output_format,
+            "client": self.client,
+        }
+    
+    @functools.cached_property
+    def payment(self) -> ZendFiPaymentTool:
+        return ZendFiPaymentTool(**self._common_config(), session_limit_usd=self.session_limit_usd)
+    
+    @functools.cached_property
+    def batch_payment(self) -> ZendFiBatchPaymentTool:
+        return ZendFiBatchPaymentTool(**self._common_config(), session_limit_usd=self.session_limit_usd)
+    
+    @functools.cached_property
+    def balance(self) -> ZendFiBalanceTool:
+        return ZendFiBalanceTool(**self._common_config(), session_limit_usd=self.session_limit_usd)
+    
+    @functools.cached_property
+    def session(self) -> ZendFiSessionTool:
+        return ZendFiSessionTool(**self._common_config(), user_wallet=self.user_wallet)
+    
+    @functools.cached_property
+    def marketplace(self) -> ZendFiMarketplaceTool:
+        return ZendFiMarketplaceTool(**self._common_config())
+    
+    @functools.cached_property
+    def pricing(self) -> ZendFiPricingTool:
+        return ZendFiPricingTool(**self._common_config())
+    
+    def get_tools(self) -> List[BaseTool]:
+        """Get the default tool set (everything except batch payments)."""
+        return [
+            # Core payment tools
+            self.payment,
+            self.balance,
+            
+            # Session management
+            self.session,
+            
+            # Discovery and pricing
+            self.marketplace,
+            self.pricing,
+        ]
+
+
 def create_zendfi_tools(
     api_key: Optional[str] = None,
     mode: str = "test",
     session_limit_usd: float = 10.0,
     user_wallet: Optional[str] = None,
     debug: bool = False,
+    output_format: OutputFormat = "pretty",
 ) -> List[BaseTool]:
     """
-    Create all ZendFi tools with shared configuration.
+    Create all ZendFi tools sharing one configured ZendFiClient.
+    
+    Use ZendFiToolkit directly to build only the tools an agent needs.
     
     Args:
         api_key: ZendFi API key (or set ZENDFI_API_KEY env var)
@@ -915,6 +1746,7 @@ def create_zendfi_tools(
         session_limit_usd: Default spending limit for auto-created sessions
         user_wallet: User's Solana wallet address (or set ZENDFI_USER_WALLET env var)
         debug: Enable debug logging
+        output_format: 'pretty' (formatted text) or 'json' (compact JSON)
         
     Returns:
         List of configured ZendFi tools
@@ -924,25 +1756,14 @@ def create_zendfi_tools(
         >>> tools = create_zendfi_tools(session_limit_usd=25.0)
         >>> agent = create_agent(llm, tools)
     """
-    common_config = {
-        "api_key": api_key,
-        "mode": mode,
-        "debug": debug,
-    }
-    
-    return [
-        # Core payment tools
-        ZendFiPaymentTool(**common_config, session_limit_usd=session_limit_usd),
-        ZendFiBalanceTool(**common_config, session_limit_usd=session_limit_usd),
-        
-        # Session management
-        ZendFiAgentSessionTool(**common_config, user_wallet=user_wallet),
-        ZendFiCreateSessionTool(**common_config, user_wallet=user_wallet),
-        
-        # Discovery and pricing
-        ZendFiMarketplaceTool(**common_config),
-        ZendFiPricingTool(**common_config),
-    ]
+    return ZendFiToolkit(
+        api_key=api_key,
+        mode=mode,
+        session_limit_usd=session_limit_usd,
+        user_wallet=user_wallet,
+        debug=debug,
+        output_format=output_format,
+    ).get_tools()
 
 
 def create_minimal_zendfi_tools(
@@ -950,6 +1771,7 @@ def create_minimal_zendfi_tools(
     mode: str = "test",
     session_limit_usd: float = 10.0,
     debug: bool = False,
+    output_format: OutputFormat = "pretty",
 ) -> List[BaseTool]:
     """
     Create minimal set of ZendFi tools (payment and balance only).
@@ -961,18 +1783,16 @@ def create_minimal_zendfi_tools(
         mode: 'test' or 'live'
         session_limit_usd: Default spending limit
         debug: Enable debug logging
+        output_format: 'pretty' (formatted text) or 'json' (compact JSON)
         
     Returns:
         List with payment and balance tools only
     """
-    common_config = {
-        "api_key": api_key,
-        "mode": mode,
-        "debug": debug,
-        "session_limit_usd": session_limit_usd,
-    }
-    
-    return [
-        ZendFiPaymentTool(**common_config),
-        ZendFiBalanceTool(**common_config),
-    ]
+    toolkit = ZendFiToolkit(
+        api_key=api_key,
+        mode=mode,
+        session_limit_usd=session_limit_usd,
+        debug=debug,
+        output_format=output_format,
+    )
+    return [toolkit.payment, toolkit.balance]
@@ -2,11 +2,26 @@
 Utility functions for LangChain ZendFi integration.
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Tuple
+import functools
 import os
+import random
+import re
+import threading
 import hashlib
-import uuid
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+# Solana addresses are base58 encoded (no 0, O, I, l), 32-44 characters
+_SOLANA_ADDRESS_MATCH = re.compile(r'[1-9A-HJ-NP-Za-km-z]{32,44}').fullmatch
+
+# English month abbreviations, so display doesn't depend on the C locale
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Progress bars for the default width, indexed by filled-cell count
+_BARS_10 = tuple("█" * i + "░" * (10 - i) for i in range(11))
 
 
 def generate_idempotency_key(prefix: str = "pay") -> str:
@@ -25,7 +40,7 @@ def generate_idempotency_key(prefix: str = "pay") -> str:
         >>> key = generate_idempotency_key()
         >>> print(key)  # 'pay_a1b2c3d4e5f6...'
     """
-    return f"{prefix}_{uuid.uuid4().hex[:16]}"
+    return f"{prefix}_{os.urandom(8).hex()}"
 
 
 def format_solana_address(address: str, length: int = 8) -> str:
@@ -41,11 +56,13 @@ def format_solana_address(address: str, length: int = 8) -> str:
         
     Example:
         >>> format_solana_address('7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ')
-        '7xKNHsoa...qjCCZ'
+        '7xKNHsoa...jCCZ'
     """
-    if len(address) <= length * 2 + 3:
+    n = len(address)
+    if n <= length * 2 + 3:
         return address
-    return f"{address[:length]}...{address[-length//2:]}"
+    # Half as many characters at the end, rounded up
+    return f"{address[:length]}...{address[n - ((length + 1) >> 1):]}"
 
 
 def format_usd(amount: float, include_symbol: bool = True) -> str:
@@ -63,8 +80,36 @@ def format_usd(amount: float, include_symbol: bool = True) -> str:
         >>> format_usd(1.5)
         '$1.50'
     """
-    formatted = f"{amount:.2f}"
-    return f"${formatted}" if include_symbol else formatted
+    return f"${amount:.2f}" if include_symbol else f"{amount:.2f}"
+
+
+def format_usd_many(amounts: Iterable[float], include_symbol: bool = True) -> List[str]:
+    """
+    Format many USD amounts for display.
+    
+    Same output as format_usd, for rendering lists of transactions.
+    
+    Args:
+        amounts: Amounts in USD
+        include_symbol: Whether to include $ symbol
+        
+    Returns:
+        Formatted strings, in order
+        
+    Example:
+        >>> format_usd_many([1.5, 0.25])
+        ['$1.50', '$0.25']
+    """
+    fmt = "${:.2f}".format if include_symbol else "{:.2f}".format
+    return [fmt(amount) for amount in amounts]
+
+
+def _parse_iso(iso_timestamp: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC."""
+    # fromisoformat only understands 'Z' from Python 3.11
+    if iso_timestamp.endswith('Z'):
+        iso_timestamp = iso_timestamp[:-1] + '+00:00'
+    return datetime.fromisoformat(iso_timestamp)
 
 
 def format_timestamp(iso_timestamp: str) -> str:
@@ -79,13 +124,25 @@ def format_timestamp(iso_timestamp: str) -> str:
         
     Example:
         >>> format_timestamp('2026-01-20T15:30:00Z')
-        'Jan 20, 2026 at 3:30 PM'
+        'Jan 20, 2026 at 03:30 PM'
     """
+    # Only strings go through the cache; anything else (None, unhashable
+    # values) is passed through unchanged as before
+    if not isinstance(iso_timestamp, str):
+        return iso_timestamp
+    return _format_timestamp_str(iso_timestamp)
+
+
+@functools.lru_cache(maxsize=512)
+def _format_timestamp_str(iso_timestamp: str) -> str:
     try:
-        dt = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
-        return dt.strftime('%b %d, %Y at %I:%M %p')
-    except (ValueError, AttributeError):
+        dt = _parse_iso(iso_timestamp)
+    except ValueError:
         return iso_timestamp
+    # Same layout as strftime('%b %d, %Y at %I:%M %p')
+    hour = dt.hour % 12 or 12
+    am_pm = 'AM' if dt.hour < 12 else 'PM'
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year} at {hour:02d}:{dt.minute:02d} {am_pm}"
 
 
 def calculate_days_until(iso_timestamp: str) -> int:
@@ -99,12 +156,10 @@ def calculate_days_until(iso_timestamp: str) -> int:
         Number of days until the timestamp
     """
     try:
-        dt = datetime.fromisoformat(iso_timestamp.replace('Z', '+00:00'))
-        now = datetime.now(dt.tzinfo)
-        delta = dt - now
-        return max(0, delta.days)
+        expires_at = _parse_iso(iso_timestamp).timestamp()
     except (ValueError, AttributeError):
         return 0
+    return max(0, int((expires_at - time.time()) // 86400))
 
 
 def validate_solana_address(address: str) -> bool:
@@ -124,14 +179,30 @@ def validate_solana_address(address: str) -> bool:
         >>> validate_solana_address('7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ')
         True
     """
-    if not address:
-        return False
-    # Solana addresses are base58 encoded, 32-44 characters
-    if len(address) < 32 or len(address) > 44:
+    # Length first: it rejects most malformed input without entering the regex
+    if not address or not 32 <= len(address) <= 44:
         return False
-    # Base58 alphabet (no 0, O, I, l)
-    valid_chars = set('123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz')
-    return all(c in valid_chars for c in address)
+    return _SOLANA_ADDRESS_MATCH(address) is not None
+
+
+def validate_solana_addresses(addresses: List[str]) -> List[bool]:
+    """
+    Validate many Solana wallet addresses at once.
+    
+    Same check as validate_solana_address, for recipient lists.
+    
+    Args:
+        addresses: Wallet addresses to validate
+        
+    Returns:
+        One bool per address, in order
+        
+    Example:
+        >>> validate_solana_addresses(['7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ', 'bad'])
+        [True, False]
+    """
+    match = _SOLANA_ADDRESS_MATCH
+    return [bool(address) and match(address) is not None for address in addresses]
 
 
 def create_progress_bar(current: float, total: float, width: int = 10) -> str:
@@ -147,9 +218,10 @@ def create_progress_bar(current: float, total: float, width: int = 10) -> str:
         Progress bar string like '████████░░'
     """
     if total <= 0:
-        return "░" * width
-    percentage = min(current / total, 1.0)
-    filled = int(percentage * width)
+        return _BARS_10[0] if width == 10 else "░" * width
+    filled = int(max(0.0, min(current / total, 1.0)) * width)
+    if width == 10:
+        return _BARS_10[filled]
     return "█" * filled + "░" * (width - filled)
 
 
@@ -174,44 +246,129 @@ def get_env_or_raise(key: str, description: str = "") -> str:
     return value
 
 
+def get_envs_or_raise(keys: Dict[str, str]) -> Dict[str, str]:
+    """
+    Get several required environment variables, reporting all missing ones.
+    
+    Args:
+        keys: Environment variable names mapped to human-readable
+            descriptions (may be empty) for the error message
+        
+    Returns:
+        Environment variable values, keyed by name
+        
+    Raises:
+        ValueError: If any of the environment variables is not set
+        
+    Example:
+        >>> get_envs_or_raise({"ZENDFI_API_KEY": "API key", "ZENDFI_USER_WALLET": ""})
+        {'ZENDFI_API_KEY': 'zk_test_...', 'ZENDFI_USER_WALLET': '7xKNH...'}
+    """
+    environ = os.environ
+    values = {key: environ.get(key) for key in keys}
+    missing = [
+        f"{key} ({description})" if description else key
+        for key, description in keys.items()
+        if not values[key]
+    ]
+    if missing:
+        raise ValueError(f"Required environment variables are not set: {', '.join(missing)}")
+    return values
+
+
 class SessionKeyCache:
     """
     Simple in-memory cache for session key data.
     
     Useful for avoiding redundant API calls during a single session.
+    Holds at most `maxsize` entries, evicting the least recently used.
+    Safe to share between threads.
     """
     
-    def __init__(self, ttl_seconds: int = 300):
+    __slots__ = ("ttl_seconds", "ttl_jitter", "maxsize", "_cache", "_sets_until_sweep", "_lock")
+    
+    # Expired entries that are never looked up again are swept out
+    # every this many set() calls
+    _SWEEP_INTERVAL = 256
+    
+    def __init__(self, ttl_seconds: int = 300, ttl_jitter: float = 0.0, maxsize: int = 1024):
         """
         Initialize cache.
         
         Args:
             ttl_seconds: Time-to-live for cache entries (default: 5 minutes)
+            ttl_jitter: Randomize each entry's TTL by up to this fraction
+                (e.g. 0.1 for +/-10%), so entries set together don't all
+                expire, and get re-fetched, at the same moment
+            maxsize: Maximum number of entries (default: 1024)
         """
+        if not 0.0 <= ttl_jitter < 1.0:
+            raise ValueError("ttl_jitter must be in [0, 1)")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, tuple[Any, datetime]] = {}
+        self.ttl_jitter = ttl_jitter
+        self.maxsize = maxsize
+        # key -> (value, time.monotonic() deadline), least recently used first
+        self._cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._sets_until_sweep = self._SWEEP_INTERVAL
+        # Reads reorder the LRU list too, so every access takes the lock
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key_for(*parts: Any) -> str:
+        """
+        Build a fixed-size cache key from several parts.
+        
+        Example:
+            >>> cache.set(SessionKeyCache.key_for(user_wallet, agent_id, limit), status)
+        """
+        joined = "\x1f".join(map(str, parts)).encode()
+        return hashlib.blake2b(joined, digest_size=16).hexdigest()
     
     def get(self, key: str) -> Optional[Any]:
         """Get cached value if not expired."""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if datetime.now() - timestamp < timedelta(seconds=self.ttl_seconds):
-                return value
-            del self._cache[key]
+        cache = self._cache
+        with self._lock:
+            entry = cache.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if time.monotonic() < expires_at:
+                    cache.move_to_end(key)
+                    return value
+                del cache[key]
         return None
     
     def set(self, key: str, value: Any) -> None:
         """Set cached value."""
-        self._cache[key] = (value, datetime.now())
+        ttl = self.ttl_seconds
+        if self.ttl_jitter:
+            ttl *= 1.0 + random.uniform(-self.ttl_jitter, self.ttl_jitter)
+        cache = self._cache
+        with self._lock:
+            now = time.monotonic()
+            cache[key] = (value, now + ttl)
+            cache.move_to_end(key)
+            
+            self._sets_until_sweep -= 1
+            if self._sets_until_sweep <= 0:
+                self._sets_until_sweep = self._SWEEP_INTERVAL
+                expired = [k for k, (_, expires_at) in cache.items() if expires_at <= now]
+                for k in expired:
+                    del cache[k]
+            
+            while len(cache) > self.maxsize:
+                cache.popitem(last=False)
     
     def invalidate(self, key: str) -> None:
         """Remove cached value."""
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            self._cache.pop(key, None)
     
     def clear(self) -> None:
         """Clear all cached values."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
 
 
 # Export commonly used functions
@@ -219,10 +376,13 @@ __all__ = [
     'generate_idempotency_key',
     'format_solana_address',
     'format_usd',
+    'format_usd_many',
     'format_timestamp',
     'calculate_days_until',
     'validate_solana_address',
+    'validate_solana_addresses',
     'create_progress_bar',
     'get_env_or_raise',
+    'get_envs_or_raise',
     'SessionKeyCache',
 ]
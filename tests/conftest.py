@@ -0,0 +1,96 @@
+"""
+Shared Test Fixtures
+====================
+Tools and input schemas built once per session for tests that only
+inspect them (names, descriptions, schemas). Tests that run a tool or
+swap its client should construct their own, with a mocked client from
+mock_client_factory. Flow tests share one ZendFiClient (zendfi_client)
+and get it with _request already mocked from patched_client.
+"""
+
+from functools import lru_cache
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+from langchain_zendfi import ZendFiClient, create_zendfi_tools
+
+
+@pytest.fixture(scope="session")
+def shared_tools():
+    """The default tool set, keyed by tool name. Treat as read-only."""
+    return {tool.name: tool for tool in create_zendfi_tools(api_key="test_key")}
+
+
+@pytest.fixture(scope="session")
+def payment_tool(shared_tools):
+    return shared_tools["make_crypto_payment"]
+
+
+@pytest.fixture(scope="session")
+def marketplace_tool(shared_tools):
+    return shared_tools["search_agent_marketplace"]
+
+
+@pytest.fixture(scope="session")
+def balance_tool(shared_tools):
+    return shared_tools["check_payment_balance"]
+
+
+@pytest.fixture(scope="session")
+def pricing_tool(shared_tools):
+    return shared_tools["get_pricing_suggestion"]
+
+
+@lru_cache(maxsize=None)
+def _schema_for(model):
+    return model.model_json_schema()
+
+
+@pytest.fixture(scope="session")
+def payment_schema(payment_tool):
+    """JSON schema of the payment tool's input. Treat as read-only."""
+    return _schema_for(payment_tool.args_schema)
+
+
+@pytest.fixture(scope="session")
+def marketplace_schema(marketplace_tool):
+    """JSON schema of the marketplace tool's input. Treat as read-only."""
+    return _schema_for(marketplace_tool.args_schema)
+
+
+@pytest.fixture(scope="session")
+def balance_schema(balance_tool):
+    """JSON schema of the balance tool's input. Treat as read-only."""
+    return _schema_for(balance_tool.args_schema)
+
+
+@pytest.fixture
+def mock_client_factory():
+    """Build mocked clients for a session agent, with optional attribute overrides."""
+    def make(**overrides):
+        client = AsyncMock(spec=ZendFiClient)
+        client._session_agent_id = "test-agent"
+        for name, value in overrides.items():
+            setattr(client, name, value)
+        return client
+    return make
+
+
+@pytest_asyncio.fixture(scope="session")
+async def zendfi_client():
+    """One test-mode client for the session, closed at teardown.
+
+    Patch _request per test and set attributes with monkeypatch so
+    nothing leaks into later tests.
+    """
+    async with ZendFiClient(api_key="zk_test_mock", mode="test") as client:
+        yield client
+
+
+@pytest.fixture
+def patched_client(zendfi_client):
+    """The shared client with _request mocked for one test, plus that mock."""
+    with patch.object(zendfi_client, "_request", new_callable=AsyncMock) as mock_request:
+        yield zendfi_client, mock_request
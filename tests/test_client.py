@@ -0,0 +1,284 @@
+"""
+Unit Tests for the ZendFi HTTP Client
+=====================================
+Tests request encoding and response decoding against an in-process
+httpx transport.
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from langchain_zendfi.client import ValidationError, ZendFiClient
+
+
+def _client_with_transport(handler) -> ZendFiClient:
+    """Client whose HTTP calls go to `handler`; call from inside a running loop."""
+    client = ZendFiClient(api_key="zk_test_123")
+    client._http_clients[asyncio.get_running_loop()] = httpx.AsyncClient(
+        base_url=client.base_url,
+        transport=httpx.MockTransport(handler),
+    )
+    return client
+
+
+class TestRequestCodec:
+    """Test JSON encoding/decoding in ZendFiClient._request."""
+
+    @pytest.mark.asyncio
+    async def test_post_round_trips_json(self):
+        """POST bodies should be JSON-encoded and JSON responses decoded."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["body"] = json.loads(request.content)
+            return httpx.Response(200, json={"payment_id": "pay_1", "amount": 1.5})
+
+        client = _client_with_transport(handler)
+        result = await client._request("POST", "/api/v1/ai/smart-payment", {"amount": 1.5, "memo": "café"})
+        await client.close()
+
+        assert seen["body"] == {"amount": 1.5, "memo": "café"}
+        assert result == {"payment_id": "pay_1", "amount": 1.5}
+
+    @pytest.mark.asyncio
+    async def test_empty_response_returns_empty_dict(self):
+        """An empty success body should decode to an empty dict."""
+        client = _client_with_transport(lambda request: httpx.Response(204))
+
+        result = await client._request("POST", "/api/v1/ai/session-keys/revoke", {"session_key_id": "sk_1"})
+        await client.close()
+
+        assert result == {}
+
+
+class TestHttpClientLifecycle:
+    """Test lazy creation of the underlying httpx client."""
+
+    def test_http_client_is_rebuilt_for_a_new_event_loop(self):
+        """Each event loop should get its own httpx client."""
+        client = ZendFiClient(api_key="zk_test_123")
+
+        first = asyncio.run(client._get_client())
+        second = asyncio.run(client._get_client())
+
+        assert first is not second
+
+    def test_clients_on_closed_loops_are_dropped(self):
+        """A client whose loop has closed should be dropped once another loop needs one."""
+        client = ZendFiClient(api_key="zk_test_123")
+        first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            first_loop.run_until_complete(client._get_client())
+            first_loop.close()
+            second_loop.run_until_complete(client._get_client())
+
+            assert list(client._http_clients) == [second_loop]
+            second_loop.run_until_complete(client.close())
+        finally:
+            second_loop.close()
+
+    def test_close_releases_clients_on_every_loop(self):
+        """close() should close each loop's client, not only the current one."""
+        client = ZendFiClient(api_key="zk_test_123")
+        first_loop, second_loop = asyncio.new_event_loop(), asyncio.new_event_loop()
+        try:
+            first = first_loop.run_until_complete(client._get_client())
+            second = second_loop.run_until_complete(client._get_client())
+
+            assert not first.is_closed
+            assert first_loop.run_until_complete(client._get_client()) is first
+
+            second_loop.run_until_complete(client.close())
+
+            assert first.is_closed and second.is_closed
+        finally:
+            first_loop.close()
+            second_loop.close()
+
+    def test_threads_sharing_a_client_keep_their_own_http_client(self):
+        """Concurrent use from two threads must not close or rebuild either thread's client."""
+        client = ZendFiClient(api_key="zk_test_123")
+        barrier = threading.Barrier(2)
+        seen = {}
+        errors = []
+
+        async def use_client(name):
+            for _ in range(5):
+                http_client = await client._get_client()
+                barrier.wait(timeout=5)  # interleave the two threads' calls
+                await asyncio.sleep(0.01)
+                assert not http_client.is_closed
+                seen.setdefault(name, set()).add(http_client)
+
+        def run(name):
+            try:
+                asyncio.run(use_client(name))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ("a", "b")]
+        with patch("langchain_zendfi.client.httpx.AsyncClient", wraps=httpx.AsyncClient) as mock_client_cls:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert errors == []
+        assert mock_client_cls.call_count == 2
+        assert [len(clients) for clients in seen.values()] == [1, 1]
+        assert seen["a"] != seen["b"]
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_reused_within_a_loop(self):
+        """Repeated calls on one loop should share the httpx client."""
+        client = ZendFiClient(api_key="zk_test_123")
+
+        assert await client._get_client() is await client._get_client()
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_pool_size_follows_max_connections(self):
+        """max_connections should size both the pool and its keep-alive set."""
+        client = ZendFiClient(api_key="zk_test_123", max_connections=8)
+
+        with patch("langchain_zendfi.client.httpx.AsyncClient", wraps=httpx.AsyncClient) as mock_client_cls:
+            await client._get_client()
+        await client.close()
+
+        limits = mock_client_cls.call_args.kwargs["limits"]
+        assert limits.max_connections == 8
+        assert limits.max_keepalive_connections == 8
+
+    @pytest.mark.asyncio
+    async def test_async_with_closes_http_client(self):
+        """Leaving an `async with` block should close the pooled httpx client."""
+        async with ZendFiClient(api_key="zk_test_123") as client:
+            http_client = await client._get_client()
+
+        assert http_client.is_closed
+        assert not client._http_clients
+
+
+class TestSmartPaymentMany:
+    """Test concurrent smart payments."""
+
+    @pytest.mark.asyncio
+    async def test_payments_are_returned_in_order(self):
+        """Results should line up with the input payments, failures in place."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            if body["amount_usd"] < 0:
+                return httpx.Response(400, json={"message": "Invalid amount"})
+            return httpx.Response(200, json={
+                "payment_id": f"pay_{body['description']}",
+                "status": "confirmed",
+            })
+
+        client = _client_with_transport(handler)
+        results = await client.smart_payment_many(
+            [
+                {"agent_id": "a", "user_wallet": "W", "amount_usd": 1.0, "description": "one"},
+                {"agent_id": "a", "user_wallet": "W", "amount_usd": -1.0, "description": "bad"},
+                {"agent_id": "a", "user_wallet": "W", "amount_usd": 2.0, "description": "two"},
+            ],
+            return_exceptions=True,
+        )
+        await client.close()
+
+        assert results[0].payment_id == "pay_one"
+        assert isinstance(results[1], ValidationError)
+        assert results[2].payment_id == "pay_two"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than max_concurrency payments should be in flight at once."""
+        client = ZendFiClient(api_key="zk_test_123")
+        in_flight = 0
+        peak = 0
+
+        async def fake_payment(**payment):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return payment["description"]
+
+        with patch.object(client, "smart_payment", side_effect=fake_payment):
+            results = await client.smart_payment_many(
+                [{"description": str(n)} for n in range(10)],
+                max_concurrency=3,
+            )
+
+        assert results == [str(n) for n in range(10)]
+        assert peak == 3
+
+
+class TestSearchMarketplace:
+    """Test marketplace query parameters and ordering."""
+
+    @pytest.mark.asyncio
+    async def test_sort_and_limit_are_sent_and_applied(self):
+        """sort_by/limit should reach the server and still hold if it ignores them."""
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["params"] = dict(request.url.params)
+            return httpx.Response(200, json={"providers": [
+                {
+                    "agent_id": f"p{n}",
+                    "agent_name": f"Provider {n}",
+                    "service_type": "code-review",
+                    "price_per_unit": 0.01 * n,
+                    "wallet": f"Wallet{n}",
+                    "reputation": float(n),
+                }
+                for n in (2, 4, 3, 1)
+            ]})
+
+        client = _client_with_transport(handler)
+        providers = await client.search_marketplace(
+            "code-review", sort_by="reputation_desc", limit=2,
+        )
+        await client.close()
+
+        assert seen["params"] == {"service_type": "code-review", "sort_by": "reputation_desc", "limit": "2"}
+        assert [p.agent_id for p in providers] == ["p4", "p3"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_sort_order_is_rejected(self):
+        """An unsupported sort_by should fail before any request is made."""
+        client = ZendFiClient(api_key="zk_test_123")
+
+        with pytest.raises(ValueError, match="sort_by"):
+            await client.search_marketplace("code-review", sort_by="newest")
+
+
+class TestPackageImports:
+    """Test lazy resolution of the package-level exports."""
+
+    def test_client_import_does_not_load_tools(self):
+        """Importing the client from the package shouldn't pull in LangChain."""
+        code = (
+            "import sys\n"
+            "from langchain_zendfi import ZendFiClient\n"
+            "print('langchain_zendfi.tools' in sys.modules, 'langchain_core' in sys.modules)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert out.stdout.split() == ["False", "False"]
+
+    def test_every_public_name_resolves(self):
+        """Every name in __all__ should be reachable on the package."""
+        import langchain_zendfi
+
+        missing = [name for name in langchain_zendfi.__all__ if not hasattr(langchain_zendfi, name)]
+
+        assert missing == []
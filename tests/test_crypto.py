@@ -0,0 +1,125 @@
+"""
+Unit Tests for Device-Bound Session Key Cryptography
+====================================================
+Tests PIN validation and the encrypt/decrypt round trip.
+"""
+
+import base64
+
+import pytest
+
+from langchain_zendfi.crypto import (
+    DeviceFingerprintGenerator,
+    SessionKeyCrypto,
+    generate_keypair,
+)
+
+
+DEVICE_FP = "test-device-fingerprint"
+
+
+class TestPinValidation:
+    """Test PIN validation in SessionKeyCrypto."""
+
+    @pytest.mark.parametrize("pin", ["", "12345", "1234567", "12a456", " 12345", "123456\n"])
+    def test_rejects_malformed_pins(self, pin):
+        """Encryption should reject anything but exactly 6 digits."""
+        keypair = generate_keypair()
+        with pytest.raises(ValueError, match="6 numeric digits"):
+            SessionKeyCrypto.encrypt(keypair, pin, DEVICE_FP)
+
+    def test_rejects_non_ascii_digits(self):
+        """Non-ASCII digits (e.g. Devanagari) should not count as a valid PIN."""
+        keypair = generate_keypair()
+        with pytest.raises(ValueError, match="6 numeric digits"):
+            SessionKeyCrypto.encrypt(keypair, "१२३४५६", DEVICE_FP)
+
+    def test_round_trip_with_valid_pin(self):
+        """A keypair encrypted with a PIN should decrypt with the same PIN."""
+        keypair = generate_keypair()
+        encrypted = SessionKeyCrypto.encrypt(keypair, "123456", DEVICE_FP)
+
+        decrypted = SessionKeyCrypto.decrypt(encrypted, "123456", DEVICE_FP)
+
+        assert decrypted.public_key == keypair.public_key
+        assert bytes(decrypted.secret_key) == bytes(keypair.secret_key)
+
+    def test_wrong_pin_fails_to_decrypt(self):
+        """Decrypting with the wrong PIN should raise ValueError."""
+        keypair = generate_keypair()
+        encrypted = SessionKeyCrypto.encrypt(keypair, "123456", DEVICE_FP)
+
+        with pytest.raises(ValueError, match="Decryption failed"):
+            SessionKeyCrypto.decrypt(encrypted, "654321", DEVICE_FP)
+
+    def test_fingerprint_mismatch_fails_to_decrypt(self):
+        """Decrypting on a different device should raise ValueError."""
+        keypair = generate_keypair()
+        encrypted = SessionKeyCrypto.encrypt(keypair, "123456", DEVICE_FP)
+
+        with pytest.raises(ValueError, match="fingerprint mismatch"):
+            SessionKeyCrypto.decrypt(encrypted, "123456", "other-device")
+
+
+class TestSessionKeypair:
+    """Test SessionKeypair signing."""
+
+    def test_signer_is_built_once_and_reused(self):
+        """Repeated signs should reuse the same SigningKey instance."""
+        keypair = generate_keypair()
+        signer = keypair.signing_key
+
+        keypair.sign(b"first")
+        keypair.sign(b"second")
+
+        assert signer is not None
+        assert keypair.signing_key is signer
+
+    def test_sign_base64_encodes_signature(self):
+        """sign_base64() should be the standard base64 of sign()."""
+        keypair = generate_keypair()
+
+        encoded = keypair.sign_base64(b"message")
+
+        assert base64.b64decode(encoded) == keypair.sign(b"message")
+        assert not encoded.endswith("\n")
+
+    def test_released_keypair_cannot_sign(self):
+        """Releasing a keypair should drop its signer."""
+        keypair = generate_keypair()
+        keypair.release()
+
+        with pytest.raises(ValueError, match="released"):
+            keypair.sign(b"message")
+
+    def test_release_zeroes_secret_key(self):
+        """Releasing a keypair should overwrite the secret key bytes in place."""
+        keypair = generate_keypair()
+        secret_key = keypair.secret_key
+
+        keypair.release()
+
+        assert secret_key == bytearray(64)
+
+
+class TestDeviceFingerprint:
+    """Test device fingerprint memoization."""
+
+    def test_generate_is_memoized(self):
+        """Repeated calls should return the cached fingerprint object."""
+        DeviceFingerprintGenerator.clear_cache()
+
+        first = DeviceFingerprintGenerator.generate()
+        second = DeviceFingerprintGenerator.generate()
+
+        assert first is second
+
+    def test_clear_cache_forces_regeneration(self):
+        """clear_cache() should invalidate the memoized fingerprint."""
+        first = DeviceFingerprintGenerator.generate()
+        DeviceFingerprintGenerator.clear_cache()
+
+        second = DeviceFingerprintGenerator.generate()
+
+        assert second is not first
+        assert second.fingerprint == first.fingerprint
@@ -0,0 +1,344 @@
+"""
+Unit Tests for Device-Bound Session Keys
+========================================
+Tests SessionKeysManager and DeviceBoundSessionKey against a mocked
+backend request function.
+"""
+
+import threading
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from langchain_zendfi.crypto import LitEncryptionResult, SessionKeyCrypto
+from langchain_zendfi.session_keys import (
+    CreateSessionKeyOptions,
+    DeviceBoundSessionKey,
+    PaymentResult,
+    SessionKeyInfo,
+    SessionKeysManager,
+)
+
+
+PIN = "123456"
+
+
+def _create_response(request_data):
+    """Backend response echoing the locally generated session wallet."""
+    return {
+        "session_key_id": "sk_test_12345678",
+        "agent_id": "test-agent",
+        "session_wallet": request_data["session_public_key"],
+        "limit_usdc": request_data["limit_usdc"],
+        "expires_at": "2026-01-23T00:00:00Z",
+        "cross_app_compatible": True,
+    }
+
+
+def _make_manager():
+    mock_request = AsyncMock(side_effect=lambda method, endpoint, data: _create_response(data))
+    return SessionKeysManager(mock_request), mock_request
+
+
+class TestSessionKeyCreate:
+    """Test SessionKeysManager.create."""
+
+    @pytest.mark.asyncio
+    async def test_create_stores_unlocked_session_key(self):
+        """A freshly created session key should be loaded and usable for signing."""
+        manager, _ = _make_manager()
+
+        result = await manager.create(CreateSessionKeyOptions(
+            user_wallet="UserWallet123",
+            agent_id="test-agent",
+            limit_usdc=10.0,
+            pin=PIN,
+        ))
+
+        assert manager.is_loaded(result.session_key_id)
+        session_key = manager.get_session_key(result.session_key_id)
+        assert session_key.agent_id == "test-agent"
+        assert session_key.user_wallet == "UserWallet123"
+        assert len(manager.sign(result.session_key_id, b"message")) == 64
+
+    @pytest.mark.asyncio
+    async def test_sign_many_matches_individual_signatures(self):
+        """sign_many() should return the same signatures as repeated sign() calls."""
+        manager, _ = _make_manager()
+        result = await manager.create(CreateSessionKeyOptions(
+            user_wallet="UserWallet123",
+            agent_id="test-agent",
+            limit_usdc=10.0,
+            pin=PIN,
+        ))
+        messages = [b"first", b"second", b"third"]
+
+        signatures = manager.sign_many(result.session_key_id, messages)
+
+        assert signatures == [manager.sign(result.session_key_id, m) for m in messages]
+
+    @pytest.mark.asyncio
+    async def test_pin_encryption_runs_off_the_event_loop(self):
+        """The PBKDF2-backed encryption should run on the manager's worker pool."""
+        manager, _ = _make_manager()
+        threads = []
+        real_encrypt = SessionKeyCrypto.encrypt
+
+        def recording_encrypt(**kwargs):
+            threads.append(threading.current_thread().name)
+            return real_encrypt(**kwargs)
+
+        with patch("langchain_zendfi.session_keys.SessionKeyCrypto.encrypt", side_effect=recording_encrypt):
+            await manager.create(CreateSessionKeyOptions(
+                user_wallet="UserWallet123",
+                agent_id="test-agent",
+                limit_usdc=10.0,
+                pin=PIN,
+            ))
+
+        assert len(threads) == 1
+        assert threads[0].startswith("zendfi-session-keys")
+
+    @pytest.mark.asyncio
+    async def test_create_rejects_short_pin(self):
+        """PINs that SessionKeyCrypto would reject should fail before any work."""
+        manager, mock_request = _make_manager()
+
+        with pytest.raises(ValueError, match="6 numeric digits"):
+            await manager.create(CreateSessionKeyOptions(
+                user_wallet="UserWallet123",
+                agent_id="test-agent",
+                limit_usdc=10.0,
+                pin="1234",
+            ))
+        mock_request.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_create_sends_lit_ciphertext(self):
+        """Lit encryption results should be attached to the create request."""
+        manager, mock_request = _make_manager()
+        lit_result = LitEncryptionResult(ciphertext="cipher", data_hash="hash")
+
+        with patch(
+            "langchain_zendfi.session_keys.encrypt_keypair_with_lit",
+            return_value=lit_result,
+        ) as mock_lit:
+            await manager.create(CreateSessionKeyOptions(
+                user_wallet="UserWallet123",
+                agent_id="test-agent",
+                limit_usdc=10.0,
+                pin=PIN,
+                enable_lit_protocol=True,
+            ))
+
+        mock_lit.assert_called_once()
+        request_data = mock_request.call_args.args[2]
+        assert request_data["lit_encrypted_keypair"] == "cipher"
+        assert request_data["lit_data_hash"] == "hash"
+
+    @pytest.mark.asyncio
+    async def test_oldest_session_key_is_evicted_and_locked(self):
+        """Past max_session_keys, the least recently used key is dropped and locked."""
+        mock_request = AsyncMock(side_effect=lambda method, endpoint, data: {
+            **_create_response(data),
+            "session_key_id": f"sk_{data['agent_id']}",
+        })
+        manager = SessionKeysManager(mock_request, max_session_keys=2)
+        for agent_id in ("a", "b"):
+            await manager.create(CreateSessionKeyOptions(
+                user_wallet="UserWallet123", agent_id=agent_id, limit_usdc=10.0, pin=PIN,
+            ))
+        oldest = manager.get_session_key("sk_a")  # "b" is now least recently used
+        evicted = manager._session_keys["sk_b"]
+
+        await manager.create(CreateSessionKeyOptions(
+            user_wallet="UserWallet123", agent_id="c", limit_usdc=10.0, pin=PIN,
+        ))
+
+        assert manager.is_loaded("sk_a") and oldest.is_unlocked
+        assert not manager.is_loaded("sk_b")
+        assert not evicted.is_unlocked
+
+    @pytest.mark.asyncio
+    async def test_close_shuts_down_worker_pool(self):
+        """close() should release the worker pool used for Lit encryption."""
+        manager, _ = _make_manager()
+        executor = manager._get_executor()
+
+        await manager.close()
+
+        assert manager._executor is None
+        assert executor._shutdown
+
+
+class TestBatchRequests:
+    """Test concurrent status and payment helpers."""
+
+    @pytest.mark.asyncio
+    async def test_get_status_many_preserves_order(self):
+        """Statuses should come back in the order the IDs were given."""
+        manager = SessionKeysManager(AsyncMock(
+            side_effect=lambda method, endpoint, data: {"remaining_usdc": len(data["session_key_id"])},
+        ))
+
+        statuses = await manager.get_status_many(["a", "bbb", "cc"])
+
+        assert [s.session_key_id for s in statuses] == ["a", "bbb", "cc"]
+        assert [s.remaining_usdc for s in statuses] == [1, 3, 2]
+
+    @pytest.mark.asyncio
+    async def test_make_payment_many_can_return_failures(self):
+        """With return_exceptions, failed payments should not hide the rest."""
+        def respond(method, endpoint, data):
+            if data["amount"] < 0:
+                raise ValueError("bad amount")
+            return {"payment_id": f"pay_{data['amount']}", "status": "confirmed"}
+
+        manager = SessionKeysManager(AsyncMock(side_effect=respond))
+
+        results = await manager.make_payment_many(
+            [
+                {"session_key_id": "sk_1", "amount": 1.0, "recipient": "Recipient1"},
+                {"session_key_id": "sk_1", "amount": -1.0, "recipient": "Recipient1"},
+            ],
+            return_exceptions=True,
+        )
+
+        assert results[0].payment_id == "pay_1.0"
+        assert isinstance(results[1], ValueError)
+
+
+class TestDebugLogging:
+    """Test SessionKeysManager debug logging."""
+
+    def test_log_formats_lazily(self, capsys):
+        """Arguments should only be formatted when debug is enabled."""
+        quiet = SessionKeysManager(AsyncMock())
+        loud = SessionKeysManager(AsyncMock(), debug=True)
+
+        quiet._log("Session key locked: %.8s...", "sk_test_12345678")
+        loud._log("Session key locked: %.8s...", "sk_test_12345678")
+
+        assert capsys.readouterr().out == "[ZendFi SessionKeys] Session key locked: sk_test_...\n"
+
+
+class TestSessionKeyLoad:
+    """Test SessionKeysManager.load."""
+
+    @pytest.mark.asyncio
+    async def test_load_decrypts_fetched_blob(self):
+        """load() should decrypt the fetched blob with a key derived on the worker pool."""
+        created = await DeviceBoundSessionKey.create(
+            pin=PIN, limit_usdc=10.0, duration_days=7, user_wallet="UserWallet123",
+        )
+        encrypted = created.get_encrypted_data()
+        manager = SessionKeysManager(AsyncMock(return_value={
+            "encrypted_session_key": encrypted.encrypted_data,
+            "nonce": encrypted.nonce,
+            "device_fingerprint_valid": True,
+        }))
+
+        await manager.load("sk_test_12345678", PIN)
+
+        assert manager.get_session_wallet("sk_test_12345678") == created.get_public_key()
+
+    @pytest.mark.asyncio
+    async def test_load_skips_decrypt_when_public_key_reported(self):
+        """With session_public_key in the response, load() shouldn't decrypt."""
+        created = await DeviceBoundSessionKey.create(
+            pin=PIN, limit_usdc=10.0, duration_days=7, user_wallet="UserWallet123",
+        )
+        encrypted = created.get_encrypted_data()
+        manager = SessionKeysManager(AsyncMock(return_value={
+            "encrypted_session_key": encrypted.encrypted_data,
+            "nonce": encrypted.nonce,
+            "session_public_key": encrypted.public_key,
+        }))
+
+        with patch("langchain_zendfi.session_keys.SessionKeyCrypto.decrypt") as mock_decrypt, \
+                patch("langchain_zendfi.session_keys.SessionKeyCrypto._derive_key") as mock_derive:
+            await manager.load("sk_test_12345678", PIN)
+
+        mock_decrypt.assert_not_called()
+        mock_derive.assert_not_called()
+        assert manager.get_session_wallet("sk_test_12345678") == encrypted.public_key
+        with pytest.raises(ValueError, match="Decryption failed"):
+            manager.unlock("sk_test_12345678", "654321")
+
+    @pytest.mark.asyncio
+    async def test_load_propagates_fingerprint_mismatch(self):
+        """A backend fingerprint rejection should surface as ValueError."""
+        manager = SessionKeysManager(AsyncMock(return_value={
+            "device_fingerprint_valid": False,
+        }))
+
+        with pytest.raises(ValueError, match="different device"):
+            await manager.load("sk_test_12345678", PIN)
+        assert not manager.is_loaded("sk_test_12345678")
+
+
+class TestDeviceBoundSessionKey:
+    """Test DeviceBoundSessionKey unlock/lock caching."""
+
+    @pytest.mark.asyncio
+    async def test_unlock_caches_until_ttl_expires(self):
+        """Unlocked keypairs should be cached until the monotonic deadline."""
+        session_key = await DeviceBoundSessionKey.create(
+            pin=PIN, limit_usdc=10.0, duration_days=7, user_wallet="UserWallet123",
+        )
+        session_key.unlock_with_pin(PIN, cache_ttl_minutes=1)
+        assert session_key.is_cached()
+
+        with patch("langchain_zendfi.session_keys.time.monotonic", return_value=float("inf")):
+            assert not session_key.is_cached()
+
+    @pytest.mark.asyncio
+    async def test_lock_clears_cache(self):
+        """lock() should drop both the raw and the cached keypair."""
+        session_key = await DeviceBoundSessionKey.create(
+            pin=PIN, limit_usdc=10.0, duration_days=7, user_wallet="UserWallet123",
+        )
+        session_key.unlock_with_pin(PIN)
+
+        session_key.lock()
+
+        assert not session_key.is_cached()
+        assert not session_key.is_unlocked
+
+    @pytest.mark.asyncio
+    async def test_request_data_is_built_once(self):
+        """get_request_data() should reuse the encrypted fields across calls."""
+        session_key = await DeviceBoundSessionKey.create(
+            pin=PIN, limit_usdc=10.0, duration_days=7, user_wallet="UserWallet123",
+        )
+
+        first = session_key.get_request_data()
+        second = session_key.get_request_data()
+
+        assert first is second
+        assert first["session_public_key"] == session_key.get_public_key()
+        assert first["encrypted_session_key"] == session_key.get_encrypted_data().encrypted_data
+
+
+class TestResponseParsing:
+    """Test from_response parsers on session key result types."""
+
+    def test_payment_result_defaults(self):
+        """Missing payment fields should fall back to defaults."""
+        result = PaymentResult.from_response({"payment_id": "pay_1"})
+
+        assert result == PaymentResult(payment_id="pay_1", signature="", status="pending")
+
+    def test_session_key_info_from_response(self):
+        """Status responses should map onto SessionKeyInfo fields."""
+        info = SessionKeyInfo.from_response("sk_1", {
+            "is_active": True,
+            "limit_usdc": 10.0,
+            "remaining_usdc": 7.5,
+        })
+
+        assert info.session_key_id == "sk_1"
+        assert info.is_active
+        assert not info.is_approved
+        assert info.remaining_usdc == 7.5
+        assert info.expires_at == ""
@@ -5,20 +5,36 @@ Tests tool initialization, schemas, and output formatting.
 Uses mocked API responses matching the real ZendFi API structure.
 """
 
+import asyncio
+import dataclasses
+import json
+import sys
+import threading
+import warnings
+
+import httpx
 import pytest
+from pydantic import ValidationError as PydanticValidationError
 from unittest.mock import AsyncMock, patch, MagicMock
 from langchain_zendfi import (
     ZendFiPaymentTool,
+    ZendFiBatchPaymentTool,
     ZendFiMarketplaceTool,
     ZendFiBalanceTool,
     ZendFiCreateSessionTool,
     ZendFiAgentSessionTool,
+    ZendFiSessionTool,
     ZendFiPricingTool,
+    ZendFiToolkit,
     create_zendfi_tools,
     create_minimal_zendfi_tools,
 )
+import langchain_zendfi.tools as tools_module
 from langchain_zendfi.client import (
     ZendFiClient,
+    ZendFiAPIError,
+    InsufficientBalanceError,
+    RateLimitError,
     PaymentResult,
     SmartPaymentResult,
     SessionKeyStatus,
@@ -31,136 +47,210 @@ from langchain_zendfi.client import (
 )
 
 
+# Canonical API results; tests vary them with dataclasses.replace
+_CONFIRMED_PAYMENT = SmartPaymentResult(
+    payment_id="pay_123",
+    status="confirmed",
+    amount_usd=5.00,
+    gasless_used=False,
+    settlement_complete=True,
+    receipt_url="",
+    next_steps="",
+    created_at="2024-01-16T00:00:00Z",
+)
+_ACTIVE_STATUS = SessionKeyStatus(
+    session_key_id="session_123",
+    is_active=True,
+    is_approved=True,
+    limit_usdc=10.0,
+    used_amount_usdc=2.50,
+    remaining_usdc=7.50,
+    expires_at="2026-01-23T00:00:00Z",
+    days_until_expiry=7,
+)
+
+
 class TestToolInitialization:
     """Test that tools initialize correctly."""
     
-    def test_payment_tool_has_correct_name(self):
-        """Payment tool should have the expected name."""
-        tool = ZendFiPaymentTool(api_key="test_key")
-        assert tool.name == "make_crypto_payment"
-    
-    def test_marketplace_tool_has_correct_name(self):
-        """Marketplace tool should have the expected name."""
-        tool = ZendFiMarketplaceTool(api_key="test_key")
-        assert tool.name == "search_agent_marketplace"
-    
-    def test_balance_tool_has_correct_name(self):
-        """Balance tool should have the expected name."""
-        tool = ZendFiBalanceTool(api_key="test_key")
-        assert tool.name == "check_payment_balance"
-    
-    def test_create_session_tool_has_correct_name(self):
-        """Create session tool should have the expected name."""
-        tool = ZendFiCreateSessionTool(api_key="test_key")
-        assert tool.name == "create_session_key"
-    
-    def test_agent_session_tool_has_correct_name(self):
-        """Agent session tool should have the expected name."""
-        tool = ZendFiAgentSessionTool(api_key="test_key")
-        assert tool.name == "create_agent_session"
+    @pytest.mark.parametrize("tool_cls, expected", [
+        (ZendFiPaymentTool, "make_crypto_payment"),
+        (ZendFiMarketplaceTool, "search_agent_marketplace"),
+        (ZendFiBalanceTool, "check_payment_balance"),
+        (ZendFiSessionTool, "create_session"),
+        (ZendFiCreateSessionTool, "create_session_key"),
+        (ZendFiAgentSessionTool, "create_agent_session"),
+        (ZendFiPricingTool, "get_pricing_suggestion"),
+    ])
+    def test_tool_has_correct_name(self, shared_tools, tool_cls, expected):
+        """Each tool should have the expected name."""
+        tool = shared_tools.get(expected) or tool_cls(api_key="test_key")
+        assert isinstance(tool, tool_cls)
+        assert tool.name == expected
     
-    def test_pricing_tool_has_correct_name(self):
-        """Pricing tool should have the expected name."""
-        tool = ZendFiPricingTool(api_key="test_key")
-        assert tool.name == "get_pricing_suggestion"
-    
-    def test_tools_have_descriptions(self):
-        """All tools should have non-empty descriptions."""
-        tools = create_zendfi_tools(api_key="test_key")
+    @pytest.mark.parametrize("factory, names", [
+        (create_zendfi_tools, {
+            "make_crypto_payment",
+            "search_agent_marketplace",
+            "check_payment_balance",
+            "create_session",
+            "get_pricing_suggestion",
+        }),
+        (create_minimal_zendfi_tools, {"make_crypto_payment", "check_payment_balance"}),
+    ])
+    def test_factory_returns_described_tools(self, factory, names):
+        """Each factory should return one described tool per expected name."""
+        tools = factory(api_key="test_key")
+        
+        assert len(tools) == len(names)
+        assert {tool.name for tool in tools} == names
         for tool in tools:
-            assert tool.description
             assert len(tool.description) > 50
     
-    def test_create_zendfi_tools_returns_six_tools(self):
-        """create_zendfi_tools should return all six tools."""
+    def test_create_zendfi_tools_share_one_client(self):
+        """All tools from create_zendfi_tools should use the same client."""
         tools = create_zendfi_tools(api_key="test_key")
-        assert len(tools) == 6
+
+        clients = {id(tool._get_client()) for tool in tools}
+
+        assert len(clients) == 1
+
+    def test_toolkit_builds_tools_on_first_access(self):
+        """ZendFiToolkit should only construct the tools that are used."""
+        toolkit = ZendFiToolkit(api_key="test_key", session_limit_usd=25.0)
         
-        names = {tool.name for tool in tools}
-        assert "make_crypto_payment" in names
-        assert "search_agent_marketplace" in names
-        assert "check_payment_balance" in names
-        assert "create_session_key" in names
-        assert "create_agent_session" in names
-        assert "get_pricing_suggestion" in names
+        payment = toolkit.payment
+        
+        assert toolkit.payment is payment
+        assert set(vars(toolkit)) & {"balance", "session", "marketplace", "pricing"} == set()
+        assert payment.session_limit_usd == 25.0
+        assert toolkit.balance._get_client() is payment._get_client()
     
-    def test_create_minimal_tools_returns_two_tools(self):
-        """create_minimal_zendfi_tools should return payment and balance tools."""
-        tools = create_minimal_zendfi_tools(api_key="test_key")
-        assert len(tools) == 2
+    def test_create_session_tool_resolves_wallet_from_env(self, monkeypatch):
+        """An unset user_wallet should be read from ZENDFI_USER_WALLET once."""
+        monkeypatch.setenv("ZENDFI_USER_WALLET", "EnvWallet123")
+        tool = ZendFiCreateSessionTool(api_key="test_key")
+        monkeypatch.delenv("ZENDFI_USER_WALLET")
+
+        assert tool.user_wallet == "EnvWallet123"
+        assert ZendFiCreateSessionTool(api_key="test_key").user_wallet == "demo-wallet"
+        assert ZendFiCreateSessionTool(api_key="test_key", user_wallet="Mine").user_wallet == "Mine"
+
+    def test_agent_session_tool_resolves_wallet_from_env(self, monkeypatch):
+        """The agent session tool should read ZENDFI_USER_WALLET at construction only."""
+        monkeypatch.setenv("ZENDFI_USER_WALLET", "EnvWallet123")
+        tool = ZendFiAgentSessionTool(api_key="test_key")
+        monkeypatch.delenv("ZENDFI_USER_WALLET")
+
+        assert tool.user_wallet == "EnvWallet123"
+        assert ZendFiAgentSessionTool(api_key="test_key").user_wallet is None
+
+    @pytest.mark.asyncio
+    async def test_session_tool_dispatches_on_session_type(self):
+        """ZendFiSessionTool should create whichever kind of session is asked for."""
+        mock_client = AsyncMock(spec=ZendFiClient)
+        tool = ZendFiSessionTool(api_key="test_key", client=mock_client, user_wallet="Wallet123")
         
-        names = {tool.name for tool in tools}
-        assert "make_crypto_payment" in names
-        assert "check_payment_balance" in names
+        await tool._arun(session_type="session_key", agent_id="agent-1", limit_usd=5.0)
+        await tool._arun(agent_id="agent-1", max_per_day=20.0)
+        
+        mock_client.create_session_key.assert_awaited_once_with(
+            user_wallet="Wallet123", agent_id="agent-1", limit_usdc=5.0, duration_days=7,
+        )
+        kwargs = mock_client.create_agent_session.await_args.kwargs
+        assert kwargs["limits"].max_per_day == 20.0
+        assert kwargs["duration_hours"] == 24
+    
+    def test_agent_session_limits_are_memoized(self):
+        """Identical limit arguments should reuse one SessionLimits instance."""
+        limits = tools_module._make_limits(50.0, 100.0)
+
+        assert tools_module._make_limits(50.0, 100.0) is limits
+        assert limits.max_per_week == 700.0
+        assert limits.max_per_month == 3000.0
+
+    def test_standalone_tool_builds_its_own_client(self):
+        """A tool without an injected client should create one lazily."""
+        tool = ZendFiBalanceTool(api_key="test_key")
+
+        assert tool.client is None
+        assert tool._get_client() is tool._get_client()
+
+    def test_minimal_tools_share_one_client(self):
+        """Payment and balance tools from the minimal factory should share a client."""
+        payment_tool, balance_tool = create_minimal_zendfi_tools(api_key="test_key", session_limit_usd=5.0)
+        
+        assert payment_tool._get_client() is balance_tool._get_client()
+        assert payment_tool._get_client().session_limit_usd == 5.0
 
 
 class TestPaymentToolSchema:
     """Test payment tool input schema."""
     
-    def test_payment_tool_has_args_schema(self):
+    def test_payment_tool_has_args_schema(self, payment_tool):
         """Payment tool should have an args schema."""
-        tool = ZendFiPaymentTool(api_key="test_key")
-        assert tool.args_schema is not None
+        assert payment_tool.args_schema is not None
     
-    def test_payment_schema_requires_recipient(self):
-        """Payment schema should require recipient field."""
-        tool = ZendFiPaymentTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        assert "recipient" in schema["properties"]
-        assert "recipient" in schema["required"]
+    def test_args_are_built_once_and_copied_per_caller(self):
+        """Tool args should be built once per input model, and edits shouldn't leak."""
+        first = ZendFiPaymentTool(api_key="test_key")
+        second = ZendFiPaymentTool(api_key="other_key")
+        first_args = first.args
+        
+        with patch.object(second.args_schema, "model_json_schema") as mock_schema:
+            second_args = second.args
+        first_args["extra"] = 1
+        first_args["amount_usd"]["type"] = "string"
+        
+        mock_schema.assert_not_called()
+        assert set(second.args) == {"recipient", "amount_usd", "description"}
+        assert second.args == second_args
+        assert second_args["amount_usd"]["type"] == "number"
     
-    def test_payment_schema_requires_amount(self):
-        """Payment schema should require amount_usd field."""
-        tool = ZendFiPaymentTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        assert "amount_usd" in schema["properties"]
-        assert "amount_usd" in schema["required"]
+    @pytest.mark.parametrize("field", ["recipient", "amount_usd", "description"])
+    def test_payment_schema_requires_field(self, payment_schema, field):
+        """Payment schema should define and require each payment field."""
+        assert field in payment_schema["properties"]
+        assert field in payment_schema["required"]
     
-    def test_payment_schema_requires_description(self):
-        """Payment schema should require description field."""
-        tool = ZendFiPaymentTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        assert "description" in schema["properties"]
-        assert "description" in schema["required"]
+    def test_payment_schema_instances_are_frozen(self, payment_tool):
+        """Validated payment inputs should be immutable."""
+        payment = payment_tool.args_schema(recipient="Wallet123", amount_usd=1.0, description="Test")
+        
+        with pytest.raises(PydanticValidationError):
+            payment.amount_usd = 1000.0
 
 
 class TestMarketplaceToolSchema:
     """Test marketplace tool input schema."""
     
-    def test_marketplace_tool_has_args_schema(self):
+    def test_marketplace_tool_has_args_schema(self, marketplace_tool):
         """Marketplace tool should have an args schema."""
-        tool = ZendFiMarketplaceTool(api_key="test_key")
-        assert tool.args_schema is not None
-    
-    def test_marketplace_schema_requires_service_type(self):
-        """Marketplace schema should require service_type."""
-        tool = ZendFiMarketplaceTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        assert "service_type" in schema["properties"]
-        assert "service_type" in schema["required"]
+        assert marketplace_tool.args_schema is not None
     
-    def test_marketplace_schema_has_optional_max_price(self):
-        """Marketplace schema should have optional max_price."""
-        tool = ZendFiMarketplaceTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        assert "max_price" in schema["properties"]
-        # max_price should NOT be required
-        assert "max_price" not in schema.get("required", [])
+    @pytest.mark.parametrize("field, required", [
+        ("service_type", True),
+        ("max_price", False),
+        ("min_reputation", False),
+        ("top_k", False),
+        ("sort_by", False),
+    ])
+    def test_marketplace_schema_required_fields(self, marketplace_schema, field, required):
+        """Only service_type should be required; the filters are optional."""
+        assert field in marketplace_schema["properties"]
+        assert (field in marketplace_schema.get("required", [])) is required
 
 
 class TestBalanceToolSchema:
     """Test balance tool input schema."""
     
-    def test_balance_tool_has_args_schema(self):
+    def test_balance_tool_has_args_schema(self, balance_tool):
         """Balance tool should have an args schema (even if empty)."""
-        tool = ZendFiBalanceTool(api_key="test_key")
-        assert tool.args_schema is not None
+        assert balance_tool.args_schema is not None
     
-    def test_balance_schema_has_no_required_fields(self):
+    def test_balance_schema_has_no_required_fields(self, balance_schema):
         """Balance schema should not require any fields."""
-        tool = ZendFiBalanceTool(api_key="test_key")
-        schema = tool.args_schema.model_json_schema()
-        required = schema.get("required", [])
+        required = balance_schema.get("required", [])
         assert len(required) == 0
 
 
@@ -168,22 +258,17 @@ class TestPaymentToolExecution:
     """Test payment tool execution with mocked client."""
     
     @pytest.mark.asyncio
-    async def test_successful_payment_returns_confirmation(self):
+    async def test_successful_payment_returns_confirmation(self, mock_client_factory):
         """Successful payment should return confirmation message."""
         tool = ZendFiPaymentTool(api_key="test_key")
         
         # Mock the client with SmartPaymentResult (production API)
-        mock_client = AsyncMock()
-        mock_client._session_agent_id = "test-agent"
-        mock_client.smart_payment.return_value = SmartPaymentResult(
-            payment_id="pay_123",
-            status="confirmed",
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.return_value = dataclasses.replace(
+            _CONFIRMED_PAYMENT,
             amount_usd=1.50,
             gasless_used=True,
-            settlement_complete=True,
             receipt_url="https://api.zendfi.tech/receipt/pay_123",
-            next_steps="",
-            created_at="2024-01-16T00:00:00Z",
             transaction_signature="5wHuFakeSignature12345678901234567890",
             confirmed_in_ms=450,
         )
@@ -198,23 +283,42 @@ class TestPaymentToolExecution:
         assert "successful" in result.lower() or "✅" in result
         assert "$1.50" in result
         assert "TestWallet123" in result
+        assert result.endswith(
+            "Status: confirmed\n"
+            "Gasless: Yes (ZendFi paid the network fees)\n"
+            "Receipt: https://api.zendfi.tech/receipt/pay_123\n"
+            "Confirmed in: 450ms"
+        )
     
     @pytest.mark.asyncio
-    async def test_payment_formats_amount_correctly(self):
+    async def test_json_output_format(self, mock_client_factory):
+        """With output_format='json', results and errors should be JSON objects."""
+        tool = ZendFiPaymentTool(api_key="test_key", output_format="json")
+        
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.side_effect = [
+            dataclasses.replace(_CONFIRMED_PAYMENT, amount_usd=1.50, gasless_used=True),
+            ZendFiAPIError("recipient rejected"),
+        ]
+        tool._client = mock_client
+        
+        ok = json.loads(await tool._arun(recipient="Wallet123", amount_usd=1.50, description="Test"))
+        failed = json.loads(await tool._arun(recipient="Wallet123", amount_usd=1.50, description="Test"))
+        
+        assert ok["payment_id"] == "pay_123"
+        assert ok["amount_usd"] == 1.50
+        assert ok["recipient"] == "Wallet123"
+        assert failed == {"error": "api_error", "message": "recipient rejected"}
+    
+    @pytest.mark.asyncio
+    async def test_payment_formats_amount_correctly(self, mock_client_factory):
         """Payment confirmation should format amounts with 2 decimal places."""
         tool = ZendFiPaymentTool(api_key="test_key")
         
-        mock_client = AsyncMock()
-        mock_client._session_agent_id = "test-agent"
-        mock_client.smart_payment.return_value = SmartPaymentResult(
-            payment_id="pay_123",
-            status="confirmed",
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.return_value = dataclasses.replace(
+            _CONFIRMED_PAYMENT,
             amount_usd=10.00,
-            gasless_used=False,
-            settlement_complete=True,
-            receipt_url="",
-            next_steps="",
-            created_at="2024-01-16T00:00:00Z",
             transaction_signature="5wHuFakeSignature",
         )
         tool._client = mock_client
@@ -229,21 +333,14 @@ class TestPaymentToolExecution:
         assert "$10.00" in result
     
     @pytest.mark.asyncio
-    async def test_payment_shows_gasless_indicator(self):
+    async def test_payment_shows_gasless_indicator(self, mock_client_factory):
         """Payment should indicate when gasless was used."""
         tool = ZendFiPaymentTool(api_key="test_key")
         
-        mock_client = AsyncMock()
-        mock_client._session_agent_id = "test-agent"
-        mock_client.smart_payment.return_value = SmartPaymentResult(
-            payment_id="pay_123",
-            status="confirmed",
-            amount_usd=5.00,
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.return_value = dataclasses.replace(
+            _CONFIRMED_PAYMENT,
             gasless_used=True,
-            settlement_complete=True,
-            receipt_url="",
-            next_steps="",
-            created_at="2024-01-16T00:00:00Z",
             transaction_signature="5wHuFakeSignature",
         )
         tool._client = mock_client
@@ -255,17 +352,156 @@ class TestPaymentToolExecution:
         )
         
         assert "gasless" in result.lower() or "🎁" in result
+    
+    @pytest.mark.asyncio
+    async def test_payment_description_is_not_reformatted(self, mock_client_factory):
+        """User text containing braces should appear verbatim in the output."""
+        tool = ZendFiPaymentTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.return_value = _CONFIRMED_PAYMENT
+        tool._client = mock_client
+        
+        result = await tool._arun(
+            recipient="Wallet123",
+            amount_usd=5.00,
+            description="Order {id} for {amount_usd}",
+        )
+        
+        assert "Description: Order {id} for {amount_usd}" in result
+        assert "Transaction: pending" in result
+
+    
+    @pytest.mark.asyncio
+    async def test_parallel_preflight_cancels_unaffordable_payment(self, mock_client_factory):
+        """A low balance arriving first should cancel the in-flight payment."""
+        tool = ZendFiPaymentTool(api_key="test_key", preflight_parallel=True)
+        
+        async def slow_payment(**kwargs):
+            await asyncio.sleep(10)
+        
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.side_effect = slow_payment
+        mock_client.get_session_status.return_value = dataclasses.replace(
+            _ACTIVE_STATUS,
+            used_amount_usdc=9.50,
+            remaining_usdc=0.50,
+        )
+        tool._client = mock_client
+        
+        result = await asyncio.wait_for(
+            tool._arun(recipient="Wallet123", amount_usd=5.00, description="Test"),
+            timeout=1,
+        )
+        
+        assert "Insufficient Balance" in result
+    
+    @pytest.mark.asyncio
+    async def test_parallel_preflight_pays_when_affordable(self, mock_client_factory):
+        """With enough balance the payment result should be returned as usual."""
+        tool = ZendFiPaymentTool(api_key="test_key", preflight_parallel=True)
+        
+        mock_client = mock_client_factory()
+        mock_client.get_session_status.return_value = dataclasses.replace(
+            _ACTIVE_STATUS,
+            used_amount_usdc=0.0,
+            remaining_usdc=10.0,
+        )
+        mock_client.smart_payment.return_value = _CONFIRMED_PAYMENT
+        tool._client = mock_client
+        
+        result = await tool._arun(recipient="Wallet123", amount_usd=5.00, description="Test")
+        
+        assert "Payment ID: pay_123" in result
+    
+    @pytest.mark.asyncio
+    async def test_api_error_message_includes_reason(self, mock_client_factory):
+        """API failures should be reported with the error text spliced in."""
+        tool = ZendFiPaymentTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.side_effect = ZendFiAPIError("recipient rejected")
+        tool._client = mock_client
+        
+        result = await tool._arun(recipient="Wallet123", amount_usd=5.00, description="Test")
+        
+        assert result.startswith("Payment Failed: recipient rejected\n")
+        assert "valid Solana wallet" in result
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("error, expected", [
+        (InsufficientBalanceError("low"), "You tried to pay $5.00"),
+        (RateLimitError("slow down"), "Payment Failed: slow down"),
+        (RuntimeError("boom"), "Unexpected Error: boom"),
+    ])
+    async def test_errors_dispatch_to_nearest_template(self, mock_client_factory, error, expected):
+        """Exceptions without their own entry should use their closest base's."""
+        tool = ZendFiPaymentTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.smart_payment.side_effect = error
+        tool._client = mock_client
+        
+        result = await tool._arun(recipient="Wallet123", amount_usd=5.00, description="Test")
+        
+        assert expected in result
+
+
+class TestBatchPaymentToolExecution:
+    """Test batch payment tool execution with mocked client."""
+    
+    @pytest.mark.asyncio
+    async def test_batch_reports_each_payment_and_caches_balance(self):
+        """Each payment gets a line, and the refreshed balance is reused."""
+        mock_client = AsyncMock(spec=ZendFiClient)
+        mock_client._session_agent_id = "test-agent"
+        mock_client.smart_payment_many.return_value = [
+            dataclasses.replace(
+                _CONFIRMED_PAYMENT,
+                payment_id="pay_1",
+                amount_usd=0.50,
+                gasless_used=True,
+            ),
+            ZendFiAPIError("recipient rejected"),
+        ]
+        mock_client.get_session_status.return_value = dataclasses.replace(
+            _ACTIVE_STATUS,
+            used_amount_usdc=0.50,
+            remaining_usdc=9.50,
+        )
+        batch_tool = ZendFiBatchPaymentTool(api_key="test_key", client=mock_client)
+        balance_tool = ZendFiBalanceTool(api_key="test_key", client=mock_client)
+        
+        result = await batch_tool.ainvoke({"payments": [
+            {"recipient": "Wallet1", "amount_usd": 0.50, "description": "Tokens"},
+            {"recipient": "Wallet2", "amount_usd": 1.00, "description": "Images"},
+        ]})
+        await balance_tool._arun()
+        
+        assert "1 of 2 succeeded" in result
+        assert "1. ✅ $0.50 to Wallet1 (Tokens) - Payment ID: pay_1" in result
+        assert "2. ❌ $1.00 to Wallet2 (Images) - recipient rejected" in result
+        assert "Total paid: $0.50 USD" in result
+        assert "Remaining balance: $9.50 / $10.00 USD" in result
+        sent = mock_client.smart_payment_many.await_args.args[0]
+        assert [p["user_wallet"] for p in sent] == ["Wallet1", "Wallet2"]
+        assert mock_client.get_session_status.await_count == 1
+    
+    def test_batch_schema_rejects_empty_list(self):
+        """At least one payment is required."""
+        with pytest.raises(PydanticValidationError):
+            ZendFiBatchPaymentTool(api_key="test_key").args_schema(payments=[])
 
 
 class TestMarketplaceToolExecution:
     """Test marketplace tool execution with mocked client."""
     
     @pytest.mark.asyncio
-    async def test_search_returns_formatted_providers(self):
+    async def test_search_returns_formatted_providers(self, mock_client_factory):
         """Marketplace search should return formatted provider list."""
         tool = ZendFiMarketplaceTool(api_key="test_key")
         
-        mock_client = AsyncMock()
+        mock_client = mock_client_factory()
         mock_client.search_marketplace.return_value = [
             AgentProvider(
                 agent_id="provider-1",
@@ -290,11 +526,52 @@ class TestMarketplaceToolExecution:
         assert "ProviderWallet123" in result
     
     @pytest.mark.asyncio
-    async def test_empty_search_returns_helpful_message(self):
+    async def test_search_lists_every_provider_in_order(self, mock_client_factory):
+        """Each provider should be numbered in the order returned."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = [
+            AgentProvider(
+                agent_id=f"provider-{n}",
+                agent_name=f"Provider {n}",
+                service_type="gpt4-tokens",
+                price_per_unit=0.01 * n,
+                wallet=f"Wallet{n}",
+                reputation=float(n),
+            )
+            for n in range(1, 4)
+        ]
+        tool._client = mock_client
+        
+        result = await tool._arun(service_type="gpt4-tokens")
+        
+        assert result.startswith("Found 3 provider(s) for 'gpt4-tokens'")
+        assert result.index("**1. Provider 1**") < result.index("**3. Provider 3**")
+        assert "⭐⭐⭐☆☆ (3.0/5.0)" in result
+        assert result.endswith("as 'amount_usd'")
+    
+    @pytest.mark.asyncio
+    async def test_search_forwards_top_k_and_sort_order(self, mock_client_factory):
+        """top_k and sort_by should be passed through to the client."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = []
+        tool._client = mock_client
+        
+        await tool._arun(service_type="gpt4-tokens", top_k=3, sort_by="reputation_desc")
+        
+        kwargs = mock_client.search_marketplace.await_args.kwargs
+        assert kwargs["limit"] == 3
+        assert kwargs["sort_by"] == "reputation_desc"
+    
+    @pytest.mark.asyncio
+    async def test_empty_search_returns_helpful_message(self, mock_client_factory):
         """Empty search results should return helpful message."""
         tool = ZendFiMarketplaceTool(api_key="test_key")
         
-        mock_client = AsyncMock()
+        mock_client = mock_client_factory()
         mock_client.search_marketplace.return_value = []
         tool._client = mock_client
         
@@ -304,50 +581,303 @@ class TestMarketplaceToolExecution:
         
         assert "no provider" in result.lower() or "not found" in result.lower()
 
+    @pytest.mark.asyncio
+    async def test_repeated_search_is_served_from_cache(self, mock_client_factory):
+        """Identical searches within the TTL should hit the backend once."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = []
+        tool._client = mock_client
+        
+        first = await tool._arun(service_type="gpt4-tokens")
+        second = await tool._arun(service_type="gpt4-tokens")
+        await tool._arun(service_type="image-generation")
+        
+        assert first == second
+        assert mock_client.search_marketplace.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_json_output_lists_providers(self, mock_client_factory):
+        """JSON output should carry the provider fields without formatting."""
+        tool = ZendFiMarketplaceTool(api_key="test_key", output_format="json")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = [
+            AgentProvider(
+                agent_id="provider-1",
+                agent_name="Test Provider",
+                service_type="gpt4-tokens",
+                price_per_unit=0.10,
+                wallet="ProviderWallet123",
+                reputation=4.5,
+            ),
+        ]
+        tool._client = mock_client
+        
+        result = json.loads(await tool._arun(service_type="gpt4-tokens"))
+        
+        assert result == {"providers": [{
+            "agent_id": "provider-1",
+            "agent_name": "Test Provider",
+            "price_per_unit": 0.10,
+            "reputation": 4.5,
+            "wallet": "ProviderWallet123",
+            "description": None,
+        }]}
+    
+    @pytest.mark.asyncio
+    async def test_out_of_range_reputation_is_clamped(self, mock_client_factory):
+        """Reputations outside 0-5 should still render a five-star bar."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = [
+            AgentProvider(
+                agent_id=f"provider-{n}",
+                agent_name=f"Provider {n}",
+                service_type="gpt4-tokens",
+                price_per_unit=0.01,
+                wallet=f"Wallet{n}",
+                reputation=reputation,
+            )
+            for n, reputation in enumerate((7.0, -1.0))
+        ]
+        tool._client = mock_client
+        
+        result = await tool._arun(service_type="gpt4-tokens", min_reputation=0.0)
+        
+        assert "⭐⭐⭐⭐⭐ (7.0/5.0)" in result
+        assert "☆☆☆☆☆ (-1.0/5.0)" in result
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_searches_share_one_request(self, mock_client_factory):
+        """Identical searches started together should hit the backend once."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        release = asyncio.Event()
+        
+        async def slow_search(**kwargs):
+            await release.wait()
+            return []
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.side_effect = slow_search
+        tool._client = mock_client
+        
+        searches = [
+            asyncio.ensure_future(tool._arun(service_type="gpt4-tokens", max_price=0.1))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*searches)
+        
+        assert len(set(results)) == 1
+        assert mock_client.search_marketplace.await_count == 1
+        assert not tool._search_inflight
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("filters, nearby", [
+        ({"max_price": 0.104}, {"max_price": 0.096}),
+        ({"min_reputation": 4.46}, {"min_reputation": 4.54}),
+    ])
+    async def test_nearby_filters_are_searched_separately(self, mock_client_factory, filters, nearby):
+        """Filters that only round to the same value must not share cached results."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.return_value = []
+        tool._client = mock_client
+        
+        await tool._arun(service_type="gpt4-tokens", **filters)
+        await tool._arun(service_type="gpt4-tokens", **nearby)
+        
+        sent = [call.kwargs for call in mock_client.search_marketplace.await_args_list]
+        assert len(sent) == 2
+        for kwargs, expected in zip(sent, (filters, nearby)):
+            assert kwargs.items() >= expected.items()
+    
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self, mock_client_factory):
+        """Failed searches should be retried on the next call."""
+        tool = ZendFiMarketplaceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.search_marketplace.side_effect = [ZendFiAPIError("boom"), []]
+        tool._client = mock_client
+        
+        assert "failed" in await tool._arun(service_type="gpt4-tokens")
+        assert "No providers" in await tool._arun(service_type="gpt4-tokens")
+
+
+class TestPricingToolExecution:
+    """Test pricing tool execution with mocked client."""
+    
+    @pytest.mark.asyncio
+    async def test_ppp_factor_is_cached_across_calls(self, mock_client_factory, monkeypatch):
+        """Repeat lookups for a country should reuse the cached PPP factor."""
+        monkeypatch.setattr("langchain_zendfi.tools._ppp_cache", {})
+        tool = ZendFiPricingTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.mode = "test"
+        mock_client.get_ppp_factor.return_value = PPPFactor(
+            country_code="BR",
+            country_name="Brazil",
+            ppp_factor=0.35,
+            currency_code="BRL",
+            adjustment_percentage=-65.0,
+        )
+        mock_client.get_pricing_suggestion.return_value = PricingSuggestion(
+            suggested_amount=3.50,
+            min_amount=3.00,
+            max_amount=10.00,
+            currency="USD",
+            reasoning="PPP adjustment for Brazil",
+            ppp_adjusted=True,
+            adjustment_factor=0.35,
+        )
+        tool._client = mock_client
+        
+        first = await tool._arun(base_price=10.0, country_code="BR")
+        second = await tool._arun(base_price=20.0, country_code="br")
+        
+        assert "PPP Factor for Brazil" in first and "PPP Factor for Brazil" in second
+        assert mock_client.get_ppp_factor.await_count == 1
+        assert mock_client.get_pricing_suggestion.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_ppp_factor_and_suggestion_are_fetched_concurrently(self, mock_client_factory, monkeypatch):
+        """Both requests should be in flight together, and a PPP failure tolerated."""
+        monkeypatch.setattr("langchain_zendfi.tools._ppp_cache", {})
+        tool = ZendFiPricingTool(api_key="test_key")
+        both_started = asyncio.Event()
+        started = []
+        
+        async def request(name):
+            started.append(name)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+        
+        async def get_ppp_factor(country_code):
+            await request("ppp")
+            raise ZendFiAPIError("unavailable")
+        
+        async def get_pricing_suggestion(**kwargs):
+            await request("suggestion")
+            return PricingSuggestion(
+                suggested_amount=7.00,
+                min_amount=5.00,
+                max_amount=10.00,
+                currency="USD",
+                reasoning="Regional adjustment",
+                ppp_adjusted=True,
+            )
+        
+        mock_client = mock_client_factory()
+        mock_client.mode = "test"
+        mock_client.get_ppp_factor.side_effect = get_ppp_factor
+        mock_client.get_pricing_suggestion.side_effect = get_pricing_suggestion
+        tool._client = mock_client
+        
+        result = await tool._arun(base_price=10.0, country_code="IN")
+        
+        assert sorted(started) == ["ppp", "suggestion"]
+        assert "Suggested Price: $7.00 USD" in result
+        assert "Could not fetch PPP data for IN" in result
+
 
 class TestBalanceToolExecution:
     """Test balance tool execution with mocked client."""
     
     @pytest.mark.asyncio
-    async def test_balance_returns_status_info(self):
+    async def test_balance_returns_status_info(self, mock_client_factory):
         """Balance check should return status information."""
         tool = ZendFiBalanceTool(api_key="test_key")
         
-        mock_client = AsyncMock()
-        mock_client.get_session_status.return_value = SessionKeyStatus(
-            session_key_id="session_123",
-            is_active=True,
-            is_approved=True,
-            limit_usdc=10.0,
-            used_amount_usdc=2.50,
-            remaining_usdc=7.50,
-            expires_at="2026-01-23T00:00:00Z",
-            days_until_expiry=7,
-        )
+        mock_client = mock_client_factory()
+        mock_client.get_session_status.return_value = _ACTIVE_STATUS
         tool._client = mock_client
         
         result = await tool._arun()
         
         assert "$7.50" in result or "7.50" in result
         assert "Active" in result or "active" in result or "🟢" in result
+    
+    @pytest.mark.asyncio
+    async def test_inactive_status_and_progress_bar(self, mock_client_factory):
+        """Inactive keys should be flagged and the bar filled per 10% remaining."""
+        tool = ZendFiBalanceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.get_session_status.return_value = dataclasses.replace(
+            _ACTIVE_STATUS,
+            is_active=False,
+            days_until_expiry=0,
+        )
+        tool._client = mock_client
+        
+        result = await tool._arun()
+        
+        assert "🔴 Status: Inactive" in result
+        assert "[███████░░░] 75% remaining" in result
+    
+    @pytest.mark.asyncio
+    async def test_back_to_back_checks_reuse_status(self, mock_client_factory):
+        """Balance checks within the TTL should fetch the status once."""
+        tool = ZendFiBalanceTool(api_key="test_key")
+        
+        mock_client = mock_client_factory()
+        mock_client.get_session_status.return_value = _ACTIVE_STATUS
+        tool._client = mock_client
+        
+        await tool._arun()
+        await tool._arun()
+        
+        assert mock_client.get_session_status.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_confirmed_payment_updates_cached_status(self):
+        """A confirmed payment should be deducted from the cached status locally."""
+        mock_client = AsyncMock(spec=ZendFiClient)
+        mock_client._session_agent_id = "test-agent"
+        mock_client.get_session_status.return_value = _ACTIVE_STATUS
+        mock_client.smart_payment.return_value = dataclasses.replace(
+            _CONFIRMED_PAYMENT,
+            amount_usd=1.00,
+        )
+        balance_tool = ZendFiBalanceTool(api_key="test_key", client=mock_client)
+        payment_tool = ZendFiPaymentTool(api_key="test_key", client=mock_client)
+        
+        await balance_tool._arun()
+        await payment_tool._arun(recipient="Wallet123", amount_usd=1.0, description="Test")
+        result = await balance_tool._arun()
+        
+        assert mock_client.get_session_status.await_count == 1
+        assert "Balance: $6.50 / $10.00 USD" in result
+        assert "Spent: $3.50 USD" in result
+        
+        # A payment that isn't confirmed yet drops the snapshot instead
+        mock_client.smart_payment.return_value = dataclasses.replace(
+            mock_client.smart_payment.return_value, status="pending",
+        )
+        await payment_tool._arun(recipient="Wallet123", amount_usd=1.0, description="Test")
+        await balance_tool._arun()
+        
+        assert mock_client.get_session_status.await_count == 2
 
 
 class TestClientIntegration:
     """Test ZendFi client functionality."""
     
-    def test_client_requires_api_key(self):
+    def test_client_requires_api_key(self, monkeypatch):
         """Client should require API key."""
-        # Clear env var if set
-        import os
-        old_key = os.environ.pop("ZENDFI_API_KEY", None)
+        monkeypatch.delenv("ZENDFI_API_KEY", raising=False)
         
-        try:
-            with pytest.raises(ValueError) as exc_info:
-                ZendFiClient()
-            assert "API key required" in str(exc_info.value)
-        finally:
-            if old_key:
-                os.environ["ZENDFI_API_KEY"] = old_key
+        with pytest.raises(ValueError) as exc_info:
+            ZendFiClient()
+        assert "API key required" in str(exc_info.value)
     
     def test_client_accepts_api_key_parameter(self):
         """Client should accept API key as parameter."""
@@ -358,7 +888,141 @@ class TestClientIntegration:
         """Client should default to test mode."""
         client = ZendFiClient(api_key="test_key")
         assert client.mode.value == "test"
+    
+    def test_own_client_matches_tool_kind(self):
+        """Spending tools should build an auto-session client; others should not."""
+        payment_client = ZendFiPaymentTool(api_key="test_key", session_limit_usd=25.0)._get_client()
+        pricing_client = ZendFiPricingTool(api_key="test_key")._get_client()
+        
+        assert payment_client.auto_create_session
+        assert payment_client.session_limit_usd == 25.0
+        assert not pricing_client.auto_create_session
 
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestSyncBridge:
+    """Test running tools synchronously."""
+
+    def test_run_without_running_loop(self):
+        """Sync invocation should work when no event loop is running."""
+        tool = ZendFiBalanceTool(api_key="test_key")
+        with patch.object(tool, "_arun", new_callable=AsyncMock) as mock_arun:
+            mock_arun.return_value = "Balance: $10.00"
+            assert tool._run() == "Balance: $10.00"
+
+    @pytest.mark.parametrize("tool_cls, args", [
+        (ZendFiPaymentTool, ("Wallet123", 1.5, "Test")),
+        (ZendFiMarketplaceTool, ("gpt4-tokens", 0.1, 4.0, 5, "price_desc")),
+        (ZendFiBalanceTool, ()),
+        (ZendFiCreateSessionTool, ("agent-1", 10.0, 7)),
+        (ZendFiAgentSessionTool, ("agent-1", 100.0, 50.0, 24)),
+        (ZendFiSessionTool, ("session_key", "agent-1", 100.0, 50.0, 24, 10.0, 7)),
+        (ZendFiPricingTool, (9.99, "BR")),
+    ])
+    def test_run_forwards_arguments_to_arun(self, tool_cls, args):
+        """Every tool's _run should await _arun with the same arguments."""
+        tool = tool_cls(api_key="test_key")
+        with patch.object(tool, "_arun", new_callable=AsyncMock) as mock_arun:
+            mock_arun.return_value = "ok"
+            assert tool._run(*args) == "ok"
+        mock_arun.assert_awaited_once_with(*args)
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.Runner needs Python 3.11+")
+    def test_sync_calls_reuse_one_loop_per_thread(self):
+        """Back-to-back sync calls on a thread should share an event loop."""
+        tool = ZendFiBalanceTool(api_key="test_key")
+        loops = []
+
+        async def fake_arun(run_manager=None):
+            loops.append(asyncio.get_running_loop())
+            return "Balance: $10.00"
+
+        with patch.object(tool, "_arun", side_effect=fake_arun):
+            tool._run()
+            tool._run()
+
+        assert loops[0] is loops[1]
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="asyncio.Runner needs Python 3.11+")
+    def test_sync_calls_from_two_threads_keep_their_http_clients(self):
+        """Interleaved sync calls on two threads should each reuse one pooled client."""
+        client = ZendFiClient(api_key="test_key")
+        tools = [ZendFiMarketplaceTool(api_key="test_key", client=client, cache_ttl_seconds=0) for _ in range(2)]
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json={"providers": []}))
+        barrier = threading.Barrier(2)
+        errors = []
+        
+        real_client_cls = httpx.AsyncClient
+        
+        def build(**kwargs):
+            return real_client_cls(**kwargs, transport=transport)
+        
+        def run(tool):
+            try:
+                for _ in range(3):
+                    barrier.wait(timeout=5)  # interleave the two threads' calls
+                    assert "No providers" in tool._run("gpt4-tokens")
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=run, args=(tool,)) for tool in tools]
+        with patch("langchain_zendfi.client.httpx.AsyncClient", side_effect=build) as mock_client_cls:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        assert errors == []
+        assert mock_client_cls.call_count == 2
+        assert not any(http_client.is_closed for http_client in client._http_clients.values())
+
+    def test_owned_loops_use_uvloop_when_installed(self):
+        """Loops created for sync calls should come from uvloop if it's available."""
+        uvloop = pytest.importorskip("uvloop")
+        loop = tools_module._new_event_loop()
+        try:
+            assert isinstance(loop, uvloop.Loop)
+        finally:
+            loop.close()
+
+    @pytest.mark.asyncio
+    async def test_run_from_anyio_worker_thread(self):
+        """Sync invocation from an AnyIO worker thread should run on the caller's loop."""
+        import anyio.to_thread
+
+        tool = ZendFiBalanceTool(api_key="test_key")
+        caller_loop = asyncio.get_running_loop()
+        seen = {}
+
+        async def fake_arun(run_manager=None):
+            seen["loop"] = asyncio.get_running_loop()
+            return "Balance: $10.00"
+
+        with patch.object(tool, "_arun", side_effect=fake_arun):
+            assert await anyio.to_thread.run_sync(tool._run) == "Balance: $10.00"
+        assert seen["loop"] is caller_loop
+
+    @pytest.mark.asyncio
+    async def test_run_inside_running_loop(self, monkeypatch):
+        """Sync invocation from inside a running loop should not re-enter it."""
+        monkeypatch.setattr("langchain_zendfi.tools._warned_sync_in_loop", True)
+        tool = ZendFiBalanceTool(api_key="test_key")
+        with patch.object(tool, "_arun", new_callable=AsyncMock) as mock_arun:
+            mock_arun.return_value = "Balance: $10.00"
+            assert tool._run() == "Balance: $10.00"
+
+    @pytest.mark.asyncio
+    async def test_run_inside_running_loop_warns_once(self, monkeypatch):
+        """Blocking a running loop should be flagged, but only the first time."""
+        monkeypatch.setattr("langchain_zendfi.tools._warned_sync_in_loop", False)
+        tool = ZendFiBalanceTool(api_key="test_key")
+        with patch.object(tool, "_arun", new_callable=AsyncMock) as mock_arun:
+            mock_arun.return_value = "Balance: $10.00"
+            with pytest.warns(RuntimeWarning, match="ainvoke"):
+                tool._run()
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                tool._run()
@@ -0,0 +1,310 @@
+"""
+Unit Tests for Utility Functions
+================================
+Tests the formatting, validation and caching helpers in
+langchain_zendfi.utils.
+"""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import patch
+
+from langchain_zendfi.utils import (
+    SessionKeyCache,
+    calculate_days_until,
+    create_progress_bar,
+    format_solana_address,
+    format_timestamp,
+    format_usd,
+    format_usd_many,
+    generate_idempotency_key,
+    get_envs_or_raise,
+    validate_solana_address,
+    validate_solana_addresses,
+)
+
+
+class TestIdempotencyKey:
+    """Test generate_idempotency_key."""
+
+    def test_key_has_prefix_and_16_hex_chars(self):
+        """Keys should be the prefix plus 16 lowercase hex characters."""
+        key = generate_idempotency_key("session")
+
+        prefix, suffix = key.split("_")
+        assert prefix == "session"
+        assert len(suffix) == 16
+        int(suffix, 16)
+
+    def test_keys_are_unique(self):
+        """Repeated calls should not produce the same key."""
+        keys = {generate_idempotency_key() for _ in range(1000)}
+
+        assert len(keys) == 1000
+
+
+class TestValidateSolanaAddress:
+    """Test validate_solana_address."""
+
+    def test_accepts_base58_address(self):
+        """A 32-44 character base58 string should be accepted."""
+        assert validate_solana_address("7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ")
+
+    @pytest.mark.parametrize("address", [
+        "",
+        "7xKNHsoap9DpE4bKNWzYXQ1GhGXgRq",  # too short
+        "7" * 45,  # too long
+        "0xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ",  # '0' is not base58
+        "7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCl",  # nor is 'l'
+    ])
+    def test_rejects_invalid_addresses(self, address):
+        """Wrong lengths and non-base58 characters should be rejected."""
+        assert not validate_solana_address(address)
+
+    def test_rejects_non_ascii_characters(self):
+        """Non-ASCII letters and digits should not pass as base58."""
+        assert not validate_solana_address("7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCC\u0662")
+
+    def test_batch_matches_scalar(self):
+        """validate_solana_addresses should agree with the scalar check."""
+        addresses = ["7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ", "", None, "0" * 40, "A" * 32]
+
+        assert validate_solana_addresses(addresses) == [
+            validate_solana_address(address) for address in addresses
+        ]
+
+
+class TestFormatTimestamp:
+    """Test format_timestamp."""
+
+    def test_formats_utc_timestamp(self):
+        """A trailing Z should be read as UTC."""
+        assert format_timestamp("2026-01-20T15:30:00Z") == "Jan 20, 2026 at 03:30 PM"
+
+    def test_formats_offset_timestamp(self):
+        """Timestamps with an explicit offset should format the same way."""
+        assert format_timestamp("2026-01-20T09:05:00+02:00") == "Jan 20, 2026 at 09:05 AM"
+
+    @pytest.mark.parametrize("iso_timestamp", [
+        "2026-03-05T00:07:00Z",
+        "2026-07-15T12:00:00Z",
+        "2026-12-31T23:59:59Z",
+    ])
+    def test_matches_strftime_layout(self, iso_timestamp):
+        """Output should match the C-locale strftime layout, midnight and noon included."""
+        dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+
+        assert format_timestamp(iso_timestamp) == dt.strftime("%b %d, %Y at %I:%M %p")
+
+    def test_unparseable_input_is_returned_unchanged(self):
+        """Strings that aren't ISO 8601 should be passed through."""
+        assert format_timestamp("next tuesday") == "next tuesday"
+
+    @pytest.mark.parametrize("value", [None, 1700000000, ["2026-01-20T15:30:00Z"]])
+    def test_non_string_input_is_returned_unchanged(self, value):
+        """Non-strings, unhashable ones included, should be passed through rather than raise."""
+        assert format_timestamp(value) is value
+
+
+class TestSessionKeyCache:
+    """Test SessionKeyCache expiry."""
+
+    def test_entry_expires_after_ttl(self):
+        """Entries should be served until the TTL elapses, then dropped."""
+        cache = SessionKeyCache(ttl_seconds=60)
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=1000.0):
+            cache.set("sk_1", "status")
+
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=1059.0):
+            assert cache.get("sk_1") == "status"
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=1060.0):
+            assert cache.get("sk_1") is None
+
+        assert "sk_1" not in cache._cache
+
+    def test_jitter_spreads_expiry(self):
+        """With ttl_jitter, each entry's TTL should vary within the bound."""
+        cache = SessionKeyCache(ttl_seconds=100, ttl_jitter=0.1)
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=0.0):
+            for i in range(50):
+                cache.set(str(i), i)
+
+        deadlines = {expires_at for _, expires_at in cache._cache.values()}
+        assert len(deadlines) > 1
+        assert all(90.0 <= d <= 110.0 for d in deadlines)
+
+    def test_evicts_least_recently_used_past_maxsize(self):
+        """Past maxsize, the entry read or written longest ago is dropped."""
+        cache = SessionKeyCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+
+        cache.set("c", 3)
+
+        assert list(cache._cache) == ["a", "c"]
+
+    def test_expired_entries_are_swept_without_lookups(self):
+        """Expired entries should not linger until their key is read again."""
+        cache = SessionKeyCache(ttl_seconds=10)
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=0.0):
+            cache.set("stale", 1)
+        with patch("langchain_zendfi.utils.time.monotonic", return_value=20.0):
+            for i in range(SessionKeyCache._SWEEP_INTERVAL):
+                cache.set(str(i), i)
+
+        assert "stale" not in cache._cache
+
+    def test_rejects_out_of_range_jitter(self):
+        """A jitter fraction outside [0, 1) should be rejected."""
+        with pytest.raises(ValueError, match="ttl_jitter"):
+            SessionKeyCache(ttl_jitter=1.5)
+
+    def test_key_for_is_stable_and_fixed_size(self):
+        """key_for should give the same 32-char key for the same parts only."""
+        key = SessionKeyCache.key_for("UserWallet123", "agent-1", 10.0)
+
+        assert key == SessionKeyCache.key_for("UserWallet123", "agent-1", 10.0)
+        assert len(key) == 32
+        assert key != SessionKeyCache.key_for("UserWallet12", "3agent-1", 10.0)
+
+    def test_instances_have_no_dict(self):
+        """SessionKeyCache should use __slots__ rather than a per-instance __dict__."""
+        cache = SessionKeyCache()
+
+        assert not hasattr(cache, "__dict__")
+        with pytest.raises(AttributeError):
+            cache.ttl = 10
+
+    def test_concurrent_access_from_threads(self):
+        """Interleaved reads, writes and invalidations shouldn't corrupt the cache."""
+        cache = SessionKeyCache(maxsize=8)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = str((i + offset) % 16)
+                    cache.set(key, i)
+                    cache.get(key)
+                    cache.invalidate(str(i % 16))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(cache._cache) <= 8
+
+    def test_invalidate_and_clear(self):
+        """invalidate() drops one entry; clear() drops them all."""
+        cache = SessionKeyCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+        cache.clear()
+        assert cache.get("b") is None
+
+
+class TestFormatUsd:
+    """Test format_usd."""
+
+    @pytest.mark.parametrize("amount, include_symbol, expected", [
+        (1.5, True, "$1.50"),
+        (1.5, False, "1.50"),
+        (0.005, True, "$0.01"),
+        (1234.0, True, "$1234.00"),
+    ])
+    def test_formats_two_decimals(self, amount, include_symbol, expected):
+        """Amounts should be shown with two decimals and an optional $."""
+        assert format_usd(amount, include_symbol) == expected
+
+    @pytest.mark.parametrize("include_symbol", [True, False])
+    def test_many_matches_scalar(self, include_symbol):
+        """format_usd_many should agree with format_usd element-wise."""
+        amounts = [1.5, 0.005, 1234.0, -2.25]
+
+        assert format_usd_many(iter(amounts), include_symbol) == [
+            format_usd(amount, include_symbol) for amount in amounts
+        ]
+
+
+class TestProgressBar:
+    """Test create_progress_bar."""
+
+    @pytest.mark.parametrize("current, total, width, expected", [
+        (5, 10, 10, "█████░░░░░"),
+        (20, 10, 10, "██████████"),
+        (-1, 10, 10, "░░░░░░░░░░"),
+        (1, 0, 10, "░░░░░░░░░░"),
+        (1, 2, 4, "██░░"),
+    ])
+    def test_bar_is_clamped_to_width(self, current, total, width, expected):
+        """Bars should always be exactly `width` cells, filled proportionally."""
+        assert create_progress_bar(current, total, width) == expected
+
+
+class TestFormatSolanaAddress:
+    """Test format_solana_address."""
+
+    @pytest.mark.parametrize("length, expected", [
+        (8, "7xKNHsoa...jCCZ"),
+        (7, "7xKNHso...jCCZ"),
+        (0, "..."),
+    ])
+    def test_shortens_long_addresses(self, length, expected):
+        """Long addresses keep `length` leading and half as many trailing chars."""
+        assert format_solana_address("7xKNHsoap9DpE4bKNWzYXQ1GhGXgRqjCCZ", length) == expected
+
+    def test_short_address_is_unchanged(self):
+        """Addresses too short to benefit from shortening are returned as is."""
+        assert format_solana_address("Wallet123") == "Wallet123"
+
+
+class TestCalculateDaysUntil:
+    """Test calculate_days_until."""
+
+    def test_counts_whole_days_remaining(self):
+        """Partial days should be rounded down."""
+        expires = datetime.now(timezone.utc) + timedelta(days=3, hours=12)
+
+        assert calculate_days_until(expires.isoformat().replace("+00:00", "Z")) == 3
+
+    def test_past_and_invalid_timestamps_are_zero(self):
+        """Expired or unparseable timestamps should count as zero days."""
+        assert calculate_days_until("2020-01-01T00:00:00Z") == 0
+        assert calculate_days_until("soon") == 0
+
+
+class TestGetEnvsOrRaise:
+    """Test get_envs_or_raise."""
+
+    def test_returns_all_values(self, monkeypatch):
+        """Every requested variable should be returned by name."""
+        monkeypatch.setenv("ZENDFI_TEST_A", "a")
+        monkeypatch.setenv("ZENDFI_TEST_B", "b")
+
+        assert get_envs_or_raise({"ZENDFI_TEST_A": "", "ZENDFI_TEST_B": ""}) == {
+            "ZENDFI_TEST_A": "a",
+            "ZENDFI_TEST_B": "b",
+        }
+
+    def test_reports_every_missing_variable(self, monkeypatch):
+        """The error should name all missing variables, with descriptions."""
+        monkeypatch.setenv("ZENDFI_TEST_A", "a")
+        monkeypatch.delenv("ZENDFI_TEST_B", raising=False)
+        monkeypatch.setenv("ZENDFI_TEST_C", "")
+
+        with pytest.raises(ValueError, match=r"ZENDFI_TEST_B \(wallet\), ZENDFI_TEST_C$"):
+            get_envs_or_raise({"ZENDFI_TEST_A": "", "ZENDFI_TEST_B": "wallet", "ZENDFI_TEST_C": ""})